@@ -1,7 +1,14 @@
 ﻿from pathlib import Path
 import sqlite3
-from typing import Iterator
+from typing import Iterator, List, Sequence, TypeVar
 
+from ace.utils.hashing import DEFAULT_FILE_HASH_ALGORITHM
+
+
+T = TypeVar("T")
+
+# Tamanho de lote para cláusulas IN (...): abaixo do limite de variáveis do SQLite
+IN_CLAUSE_CHUNK_SIZE = 500
 
 # ACE/ace/data_model/db.py -> parents[0]=data_model, [1]=ace, [2]=ACE (raiz do projeto)
 REPO_ROOT = Path(__file__).resolve().parents[2]
@@ -12,16 +19,88 @@ def get_connection() -> sqlite3.Connection:
     """
     Abre uma conexão com o banco SQLite do ACE.
     Usa row_factory=sqlite3.Row para acessar colunas por nome.
+    O journal_mode=WAL é persistido no arquivo por init_db; aqui só
+    reaplicamos os PRAGMAs que valem por conexão.
     """
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON;")
+    conn.execute("PRAGMA busy_timeout = 5000;")
+    # Em WAL, NORMAL é seguro contra corrupção e evita fsync a cada commit
+    conn.execute("PRAGMA synchronous = NORMAL;")
+    return conn
+
+
+def _apply_read_pragmas(conn: sqlite3.Connection) -> None:
+    """
+    Ajustes de leitura: cache de ~256 MiB, mmap de até 1 GiB e
+    tabelas temporárias em memória (ORDER BY / GROUP BY grandes).
+    """
+    conn.execute("PRAGMA cache_size = -262144;")
+    conn.execute("PRAGMA mmap_size = 1073741824;")
+    conn.execute("PRAGMA temp_store = MEMORY;")
+
+
+def get_readonly_connection() -> sqlite3.Connection:
+    """
+    Abre uma conexão somente leitura (mode=ro) para scripts de export/amostragem.
+    Não altera journal_mode (exige escrita); só aplica os PRAGMAs de leitura.
+    """
+    conn = sqlite3.connect(DB_PATH.resolve().as_uri() + "?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    _apply_read_pragmas(conn)
     return conn
 
 
+def get_file_hash_algorithm(conn: sqlite3.Connection) -> str:
+    """
+    Algoritmo usado em documents.file_hash neste banco (gravado por init_db
+    em ace_meta). Bancos anteriores à ace_meta usam SHA-256.
+    """
+    try:
+        row = conn.execute(
+            "SELECT value FROM ace_meta WHERE key = 'file_hash_algorithm'"
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return DEFAULT_FILE_HASH_ALGORITHM
+    return row[0] if row else DEFAULT_FILE_HASH_ALGORITHM
+
+
+# Colunas adicionadas depois da criação inicial: (tabela, coluna, tipo)
+MIGRATION_COLUMNS = [
+    # size + mtime permitem pular o SHA-256 no re-ingest de arquivos inalterados
+    ("documents", "file_size", "INTEGER"),
+    ("documents", "file_mtime_ns", "INTEGER"),
+]
+
+
+def migrate_columns(conn: sqlite3.Connection) -> List[str]:
+    """
+    CREATE TABLE IF NOT EXISTS não altera tabelas existentes;
+    aqui adicionamos as colunas novas em bancos criados antes delas.
+    Retorna as colunas adicionadas ("tabela.coluna").
+    """
+    added = []
+    for table, column, col_type in MIGRATION_COLUMNS:
+        existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
+            added.append(f"{table}.{column}")
+    conn.commit()
+    return added
+
+
 def iter_rows(cursor: sqlite3.Cursor) -> Iterator[sqlite3.Row]:
     """
     Helper simples para iterar sobre resultados com tipagem.
     """
     for row in cursor:
         yield row
+
+
+def chunked(items: Sequence[T], size: int = IN_CLAUSE_CHUNK_SIZE) -> Iterator[List[T]]:
+    """
+    Divide items em listas de no máximo size elementos (para IN (...) parametrizado).
+    """
+    for start in range(0, len(items), size):
+        yield list(items[start:start + size])
@@ -3,11 +3,14 @@ Cache de OCR - Baseado em hash de arquivo
 Evita reprocessar PDFs já extraídos
 """
 
-import hashlib
 import json
+import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+from ace.utils.atomic import atomic_write
+from ace.utils.hashing import hash_file
 from ace.utils.logger import get_logger
 
 logger = get_logger('ace.extraction.cache')
@@ -18,14 +21,20 @@ CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 
 def _get_file_hash(pdf_path: str) -> str:
-    """Calcula hash SHA256 do arquivo"""
-    sha256 = hashlib.sha256()
-    
-    with open(pdf_path, 'rb') as f:
-        for chunk in iter(lambda: f.read(8192), b''):
-            sha256.update(chunk)
+    """
+    Calcula hash SHA256 do arquivo
     
-    return sha256.hexdigest()
+    Memorizado por (caminho, mtime, tamanho): a busca no cache e o save_to_cache
+    do mesmo PDF (e novas leituras no mesmo processo) não releem o arquivo.
+    """
+    st = os.stat(pdf_path)
+    return _hash_for_stat(os.path.abspath(pdf_path), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=4096)
+def _hash_for_stat(path: str, mtime_ns: int, size: int) -> str:
+    """Hash do arquivo; mtime/tamanho só entram na chave do lru_cache"""
+    return hash_file(path)
 
 
 def get_cached_text(pdf_path: str) -> Optional[str]:
@@ -68,7 +77,8 @@ def save_to_cache(pdf_path: str, text: str):
             'text': text
         }
         
-        with open(cache_file, 'w', encoding='utf-8') as f:
+        # escrita atômica: leitor nunca vê JSON pela metade (processos em paralelo)
+        with atomic_write(cache_file) as f:
             json.dump(data, f, ensure_ascii=False)
         
         logger.debug(f"💾 Texto salvo em cache: {file_hash[:16]}...")
@@ -0,0 +1,45 @@
+﻿"""
+Escrita atômica de arquivos do ACE
+Caches e exports gravados num temporário e movidos com os.replace
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, Union
+
+
+def _read_umask() -> int:
+    """umask do processo (só dá para ler trocando; feito uma vez, na importação)"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# mkstemp cria com 0600; o arquivo final recebe o modo de um open() comum
+DEFAULT_FILE_MODE = 0o666 & ~_read_umask()
+
+
+@contextmanager
+def atomic_write(path: Union[str, Path], mode: str = "w", encoding: str = "utf-8") -> Iterator[IO]:
+    """
+    Abre um temporário no diretório de path e, ao sair do bloco sem erro,
+    move-o para path com os.replace: leitores (threads, outros processos)
+    nunca veem o arquivo pela metade. Se o bloco falhar, o temporário é
+    apagado e o arquivo anterior fica intacto.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, encoding=None if "b" in mode else encoding) as f:
+            yield f
+        os.chmod(tmp_path, DEFAULT_FILE_MODE)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,55 @@
+﻿"""
+Leitura de CSVs grandes do ACE
+Exports em db/ lidos de ponta a ponta pelos scripts de resumo
+"""
+
+import os
+from operator import itemgetter
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, TextIO, Union
+
+# Buffer grande: menos read() por arquivo em exports de centenas de MB
+CSV_READ_BUFFER_SIZE = 1 << 20
+
+
+def open_csv_for_scan(path: Union[str, Path]) -> TextIO:
+    """
+    Abre um CSV para leitura sequencial única (utf-8-sig, newline="").
+    Avisa o kernel do acesso sequencial (read-ahead agressivo) onde há
+    posix_fadvise; no Windows é só um open com buffer maior.
+    """
+    f = open(path, newline="", encoding="utf-8-sig", buffering=CSV_READ_BUFFER_SIZE)
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass  # só uma dica (ex.: ESPIPE em FIFO/pipe); a leitura segue normal
+    return f
+
+
+def column_getter(header: List[str], name: str) -> Callable[[List[str]], str]:
+    """
+    Getter da coluna name para linhas do csv.reader (índice resolvido uma vez).
+    Coluna ausente é lida como vazia, como row.get(...) or "" no DictReader.
+    """
+    if name in header:
+        return itemgetter(header.index(name))
+    return lambda row: ""
+
+
+def iter_padded_rows(
+    reader: Iterable[List[str]], width: int, truncate: bool = False
+) -> Iterator[List[str]]:
+    """
+    Linhas do csv.reader com as mesmas regras do DictReader: ignora linhas
+    vazias e completa as curtas com "" até width. Com truncate=True, corta
+    as longas em width (largura sempre igual à do cabeçalho).
+    """
+    for row in reader:
+        if not row:
+            continue
+        if len(row) < width:
+            row.extend([""] * (width - len(row)))
+        elif truncate and len(row) > width:
+            del row[width:]
+        yield row
@@ -0,0 +1,93 @@
+﻿"""
+Hash de arquivos do ACE
+Chave de deduplicação de documents e de caches em disco
+"""
+
+import hashlib
+import mmap
+import os
+from pathlib import Path
+from typing import Callable, Dict, Union
+
+from ace.utils.exceptions import ConfigurationException
+
+# xxhash é opcional: só necessário em bancos criados com file_hash_algorithm=xxh3_128
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+_XXHASH_MISSING = "xxhash não está instalado. Rode: pip install xxhash"
+
+
+# Leituras grandes: cada update() fica mais tempo dentro do OpenSSL (SHA-NI)
+HASH_CHUNK_SIZE = 1 << 20
+# Acima disso (ou arquivo vazio, que o mmap rejeita) volta para leitura em chunks
+MMAP_MAX_SIZE = 1 << 30
+
+# Algoritmo de documents.file_hash em bancos sem ace_meta (todos os anteriores)
+DEFAULT_FILE_HASH_ALGORITHM = "sha256"
+
+
+def hash_file(path: Union[str, Path]) -> str:
+    """
+    Calcula SHA256 de um arquivo.
+    Arquivos até MMAP_MAX_SIZE são mapeados em memória e hasheados num único
+    update(); os demais vão em chunks (hashlib.file_digest no Python >= 3.11).
+    """
+    with open(path, "rb", buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if 0 < size <= MMAP_MAX_SIZE:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return hashlib.sha256(mm).hexdigest()
+
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+        h = hashlib.sha256()
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def hash_file_xxh3(path: Union[str, Path]) -> str:
+    """
+    Calcula xxh3_128 de um arquivo: chave de deduplicação não criptográfica,
+    bem mais rápida que SHA-256. Requer o pacote xxhash.
+    """
+    if xxhash is None:
+        raise ConfigurationException(_XXHASH_MISSING)
+
+    with open(path, "rb", buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if 0 < size <= MMAP_MAX_SIZE:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return xxhash.xxh3_128(mm).hexdigest()
+
+        h = xxhash.xxh3_128()
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+FILE_HASHERS: Dict[str, Callable[[Union[str, Path]], str]] = {
+    "sha256": hash_file,
+    "xxh3_128": hash_file_xxh3,
+}
+
+
+def get_file_hasher(algorithm: str) -> Callable[[Union[str, Path]], str]:
+    """
+    Retorna a função de hash para o algoritmo informado.
+    Falha já aqui (não a cada arquivo) se o nome é desconhecido ou se o
+    pacote do algoritmo não está instalado.
+    """
+    try:
+        hasher = FILE_HASHERS[algorithm]
+    except KeyError:
+        raise ConfigurationException(
+            f"Algoritmo de hash desconhecido: {algorithm!r} (opções: {', '.join(FILE_HASHERS)})"
+        ) from None
+    if hasher is hash_file_xxh3 and xxhash is None:
+        raise ConfigurationException(_XXHASH_MISSING)
+    return hasher
@@ -0,0 +1,15 @@
+﻿"""
+JSON do ACE
+Leitura de relatórios e caches JSON (orjson quando instalado)
+"""
+
+import json
+
+# orjson é opcional: decodifica 2-3x mais rápido e aceita bytes direto
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Mesma interface de json.loads (str ou bytes -> objeto Python)
+json_loads = orjson.loads if orjson is not None else json.loads
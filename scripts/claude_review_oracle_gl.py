@@ -1,4 +1,5 @@
-﻿import json
+﻿import atexit
+import json
 import os
 import textwrap
 from typing import List
@@ -16,6 +17,17 @@ if not API_KEY:
 MODEL = os.getenv("ACE_ANTHROPIC_MODEL", "claude-sonnet-4-5-20250929")
 API_URL = "https://api.anthropic.com/v1/messages"
 
+# Sessão única (keep-alive): reaproveita a conexão TCP/TLS entre chamadas
+_SESSION = requests.Session()
+_SESSION.headers.update(
+    {
+        "x-api-key": API_KEY,
+        "anthropic-version": "2023-06-01",
+        "content-type": "application/json",
+    }
+)
+atexit.register(_SESSION.close)
+
 # Arquivos que queremos que o Claude revise
 FILES_TO_REVIEW: List[str] = [
     "scripts/oracle_generate_gl_ground_truth.py",
@@ -156,12 +168,6 @@ def build_user_prompt(files_blob: str) -> str:
 
 def call_claude(system_prompt: str, user_prompt: str) -> str:
     """Chama a API /v1/messages da Anthropic no formato correto."""
-    headers = {
-        "x-api-key": API_KEY,
-        "anthropic-version": "2023-06-01",
-        "content-type": "application/json",
-    }
-
     payload = {
         "model": MODEL,
         "max_tokens": 4000,
@@ -176,7 +182,7 @@ def call_claude(system_prompt: str, user_prompt: str) -> str:
         ],
     }
 
-    resp = requests.post(API_URL, headers=headers, data=json.dumps(payload))
+    resp = _SESSION.post(API_URL, data=json.dumps(payload), timeout=120)
     print(f"Status HTTP: {resp.status_code}")
     if resp.status_code != 200:
         print("Corpo da resposta de erro:")
@@ -1,6 +1,6 @@
 ﻿import csv
 import os
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional
 
 
 GL_EXPORT_PATH = os.path.join("db", "gl_export.csv")
@@ -18,6 +18,13 @@ FIELDS_TO_COMPARE = [
     "gl_each_occurrence",
 ]
 
+# schema fixo do CSV de divergências
+DISAGREEMENT_FIELDNAMES = (
+    ["certificate_id"]
+    + [f"{f}_ace" for f in FIELDS_TO_COMPARE]
+    + [f"{f}_truth" for f in FIELDS_TO_COMPARE]
+)
+
 
 def normalize_text(value: str) -> Optional[str]:
     if value is None:
@@ -49,19 +56,23 @@ def normalize_numeric(value: str) -> Optional[float]:
         return None
 
 
+# normalizador por campo, resolvido uma vez (limites GL numéricos, o resto texto)
+_NORMALIZERS: Dict[str, Callable[[str], Optional[Any]]] = {
+    f: (normalize_numeric if f in ("gl_aggregate", "gl_each_occurrence") else normalize_text)
+    for f in FIELDS_TO_COMPARE
+}
+
+
 def normalize_value(field: str, value: str) -> Optional[Any]:
-    if field in ("gl_aggregate", "gl_each_occurrence"):
-        return normalize_numeric(value)
-    # para datas e policy_number, tratamos como texto
-    return normalize_text(value)
+    return _NORMALIZERS[field](value)
 
 
 def load_csv_by_cert_id(path: str) -> Dict[str, Dict[str, str]]:
     if not os.path.exists(path):
         raise FileNotFoundError(f"Arquivo não encontrado: {path}")
 
-    with open(path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
+    with open(path, newline="", encoding="utf-8", errors="replace") as f:
+        reader = csv.DictReader(line.replace("\x00", "") for line in f)
         rows = list(reader)
 
     data: Dict[str, Dict[str, str]] = {}
@@ -92,7 +103,8 @@ def main() -> None:
 
     disagreements = []
 
-    common_ids = sorted(set(ace_data.keys()) & set(oracle_data.keys()))
+    # interseção direta das views de chaves; a ordem só importa no CSV de divergências
+    common_ids = ace_data.keys() & oracle_data.keys()
     print(f"Total de certificados com ACE + Oráculo: {len(common_ids)}")
 
     for cid in common_ids:
@@ -102,12 +114,12 @@ def main() -> None:
         row_has_disagreement = False
         row_diff: Dict[str, Any] = {"certificate_id": cid}
 
-        for field in FIELDS_TO_COMPARE:
+        for field, norm in _NORMALIZERS.items():
             pred_raw = ace_row.get(field)
             truth_raw = truth_row.get(field)
 
-            pred = normalize_value(field, pred_raw)
-            truth = normalize_value(field, truth_raw)
+            pred = norm(pred_raw)
+            truth = norm(truth_raw)
 
             m = metrics[field]
 
@@ -138,9 +150,9 @@ def main() -> None:
 
     # salvar CSV de divergências
     if disagreements:
-        fieldnames = sorted({k for row in disagreements for k in row.keys()})
+        disagreements.sort(key=lambda r: r["certificate_id"])
         with open(DISAGREEMENTS_PATH, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer = csv.DictWriter(f, fieldnames=DISAGREEMENT_FIELDNAMES, extrasaction="ignore")
             writer.writeheader()
             writer.writerows(disagreements)
         print(f"Divergências salvas em: {DISAGREEMENTS_PATH}")
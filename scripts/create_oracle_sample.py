@@ -1,11 +1,9 @@
 ﻿import csv
-import sqlite3
 import sys
-from pathlib import Path
 
-ROOT = Path(__file__).resolve().parent.parent
-DB_PATH = ROOT / "db" / "ace.sqlite"
-OUT_PATH = ROOT / "db" / "oracle_samples_gl.csv"
+from ace.data_model.db import get_readonly_connection, DB_PATH, REPO_ROOT
+
+OUT_PATH = REPO_ROOT / "db" / "oracle_samples_gl.csv"
 
 
 def main() -> None:
@@ -20,7 +18,7 @@ def main() -> None:
     if not DB_PATH.exists():
         raise SystemExit(f"Banco não encontrado: {DB_PATH}")
 
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_readonly_connection()
     cur = conn.cursor()
 
     # Importante:
@@ -1,22 +1,40 @@
 ﻿import csv
 import os
 import sys
-import sqlite3
 from typing import List
 
-DB_PATH = os.path.join("db", "ace.sqlite")
+from ace.data_model.db import get_connection, get_readonly_connection, DB_PATH
+
 SAMPLES_PATH = os.path.join("db", "oracle_samples_gl.csv")
+# tabela com os IDs da amostra, para os scripts seguintes fazerem JOIN no SQLite
+SAMPLE_TABLE = "oracle_sample_certificates"
 
 
-def get_connection() -> sqlite3.Connection:
-    return sqlite3.connect(DB_PATH)
+def emit_sample_table(cert_ids: List[int]) -> None:
+    """
+    Grava os IDs da amostra em SAMPLE_TABLE (substitui o conteúdo anterior),
+    evitando que etapas seguintes precisem reler/parsear o CSV.
+    """
+    conn = get_connection()
+    try:
+        with conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {SAMPLE_TABLE} (certificate_id INTEGER PRIMARY KEY)"
+            )
+            conn.execute(f"DELETE FROM {SAMPLE_TABLE}")
+            conn.executemany(
+                f"INSERT OR IGNORE INTO {SAMPLE_TABLE} (certificate_id) VALUES (?)",
+                [(cid,) for cid in cert_ids],
+            )
+    finally:
+        conn.close()
 
 
-def create_sample(sample_size: int) -> None:
+def create_sample(sample_size: int, emit_sqlite: bool = False) -> None:
     if not os.path.exists(DB_PATH):
         raise FileNotFoundError(f"Banco não encontrado: {DB_PATH}")
 
-    with get_connection() as conn:
+    with get_readonly_connection() as conn:
         cur = conn.cursor()
         # Pegamos só certificados com GL extraído com sucesso
         cur.execute(
@@ -42,10 +60,15 @@ def create_sample(sample_size: int) -> None:
     print(f"Criado arquivo de amostra: {SAMPLES_PATH}")
     print(f"Total de certificados na amostra: {len(rows)}")
 
+    if emit_sqlite:
+        emit_sample_table([cid for (cid,) in rows])
+        print(f"Amostra também gravada na tabela {SAMPLE_TABLE}")
+
 
 def main() -> None:
-    sample_size = int(sys.argv[1]) if len(sys.argv) >= 2 else 50
-    create_sample(sample_size)
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    sample_size = int(args[0]) if args else 50
+    create_sample(sample_size, emit_sqlite="--emit-sqlite" in sys.argv[1:])
 
 
 if __name__ == "__main__":
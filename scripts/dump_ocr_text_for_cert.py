@@ -1,18 +1,17 @@
 ﻿import os
 from pathlib import Path
-import sqlite3
 
+from ace.data_model.db import get_readonly_connection
 from ace.extraction.layout import extract_text_from_pdf
 from ace.extraction.ocr import extract_text_with_ocr, OcrMode
 
 ROOT = Path(__file__).resolve().parent.parent
-DB_PATH = ROOT / "db" / "ace.sqlite"
 DOCS_DIR = ROOT / "db" / "docs"
 DEBUG_DIR = ROOT / "db" / "ocr_debug"
 
 
 def get_certificate_path(cert_id: int) -> Path:
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_readonly_connection()
     try:
         cur = conn.execute(
             "SELECT storage_path FROM certificates WHERE id = ?", (cert_id,)
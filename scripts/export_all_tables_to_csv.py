@@ -1,11 +1,9 @@
 ﻿import csv
-import sqlite3
-from pathlib import Path
 
-# Raiz do projeto ACE
-ROOT = Path(__file__).resolve().parent.parent
-DB_PATH = ROOT / "db" / "ace.sqlite"
-EXPORT_DIR = ROOT / "db" / "exports"
+from ace.data_model.db import get_readonly_connection, DB_PATH, REPO_ROOT
+
+EXPORT_DIR = REPO_ROOT / "db" / "exports"
+FETCH_BATCH_SIZE = 10000
 
 
 def export_all_tables():
@@ -14,8 +12,7 @@ def export_all_tables():
 
     EXPORT_DIR.mkdir(parents=True, exist_ok=True)
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_readonly_connection()
     cur = conn.cursor()
 
     # Lista todas as tabelas do SQLite (exceto internas)
@@ -33,21 +30,17 @@ def export_all_tables():
         print(f"Exportando tabela {table} -> {out_path}")
 
         cur.execute(f"SELECT * FROM {table}")
-        rows = cur.fetchall()
-        if not rows:
-            # ainda assim escreve header
-            col_names = [d[0] for d in cur.description]
-            with out_path.open("w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(col_names)
-            continue
-
-        col_names = rows[0].keys()
+        # header vem do cursor (funciona também para tabela vazia)
+        col_names = [d[0] for d in cur.description]
         with out_path.open("w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
             writer.writerow(col_names)
-            for row in rows:
-                writer.writerow([row[c] for c in col_names])
+            # lotes limitados; sqlite3.Row já é uma sequência, sem lookup por coluna
+            while True:
+                batch = cur.fetchmany(FETCH_BATCH_SIZE)
+                if not batch:
+                    break
+                writer.writerows(batch)
 
     conn.close()
     print("\nExport finalizado. Arquivos em:", EXPORT_DIR)
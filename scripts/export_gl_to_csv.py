@@ -1,14 +1,14 @@
 ﻿import csv
 from pathlib import Path
 
-from ace.data_model.db import get_connection, DB_PATH
+from ace.data_model.db import get_readonly_connection, DB_PATH
 
 
 OUTPUT_PATH = Path("db") / "gl_export.csv"
 
 
 def export_gl_to_csv() -> None:
-    conn = get_connection()
+    conn = get_readonly_connection()
     try:
         cur = conn.cursor()
         print(f"Usando banco em: {DB_PATH}")
@@ -1,24 +1,26 @@
-﻿import sys
-import shutil
+﻿import os
+import sys
+import tempfile
 import zipfile
 from pathlib import Path
 
-from ace.data_model.db import get_connection, DB_PATH
+from ace.data_model.db import get_readonly_connection, DB_PATH
+from ace.utils.atomic import DEFAULT_FILE_MODE
 
 
-OUTPUT_DIR = Path("db") / "success_pdfs"
 ZIP_PATH = Path("db") / "success_pdfs_gl_sample.zip"
 
 
 def export_success_pdfs(limit: int = 50) -> None:
     """
-    Copia PDFs dos certificates com extraction_status = 'SUCCESS'
-    (limitados a N registros) para uma pasta local e gera um ZIP.
+    Grava os PDFs dos certificates com extraction_status = 'SUCCESS'
+    (limitados a N registros) direto num ZIP, sem pasta intermediária.
 
-    - OUTPUT_DIR: db/success_pdfs
     - ZIP_PATH:   db/success_pdfs_gl_sample.zip
+
+    PDFs já são comprimidos, então usamos ZIP_STORED (sem deflate).
     """
-    conn = get_connection()
+    conn = get_readonly_connection()
     try:
         cur = conn.cursor()
         rows = cur.execute(
@@ -40,44 +42,49 @@ def export_success_pdfs(limit: int = 50) -> None:
         print("Nenhum certificate com status SUCCESS encontrado.")
         return
 
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-
     print(f"Usando banco em: {DB_PATH}")
-    print(f"Copiando PDFs para: {OUTPUT_DIR.resolve()}")
+    print(f"Gerando ZIP em: {ZIP_PATH.resolve()}")
     print(f"Total previsto (limit): {len(rows)}\n")
 
-    copied = 0
-    for row in rows:
-        cid = row["certificate_id"]
-        src = Path(row["storage_path"])
-
-        if not src.exists():
-            print(f"[WARN] Arquivo não encontrado para cert {cid}: {src}")
-            continue
-
-        dst_name = f"cert_{cid:04d}__{src.name}"
-        dst = OUTPUT_DIR / dst_name
+    ZIP_PATH.parent.mkdir(parents=True, exist_ok=True)
 
-        try:
-            shutil.copy2(src, dst)
-            print(f"[OK] Cert {cid} -> {dst.name}")
-            copied += 1
-        except Exception as e:
-            print(f"[ERRO] Ao copiar cert {cid} ({src}): {e}")
+    # Grava num temporário em db/ e só substitui ZIP_PATH se algo foi copiado:
+    # um export anterior não é apagado por uma execução sem arquivos (ou com erro)
+    fd, tmp_path = tempfile.mkstemp(dir=ZIP_PATH.parent, suffix=".zip.tmp")
+    copied = 0
+    replaced = False
+    try:
+        with os.fdopen(fd, "wb") as f, \
+                zipfile.ZipFile(f, "w", zipfile.ZIP_STORED, allowZip64=True) as zf:
+            for row in rows:
+                cid = row["certificate_id"]
+                src = Path(row["storage_path"])
+
+                if not src.exists():
+                    print(f"[WARN] Arquivo não encontrado para cert {cid}: {src}")
+                    continue
+
+                arcname = f"cert_{cid:04d}__{src.name}"
+
+                try:
+                    zf.write(src, arcname=arcname)
+                    print(f"[OK] Cert {cid} -> {arcname}")
+                    copied += 1
+                except Exception as e:
+                    print(f"[ERRO] Ao adicionar cert {cid} ({src}): {e}")
+
+        if copied:
+            os.chmod(tmp_path, DEFAULT_FILE_MODE)
+            os.replace(tmp_path, ZIP_PATH)
+            replaced = True
+    finally:
+        if not replaced:
+            os.unlink(tmp_path)
 
     if copied == 0:
         print("\nNenhum arquivo copiado, ZIP não será criado.")
         return
 
-    # Gera o ZIP
-    if ZIP_PATH.exists():
-        ZIP_PATH.unlink()
-
-    with zipfile.ZipFile(ZIP_PATH, "w", zipfile.ZIP_DEFLATED) as zf:
-        for path in OUTPUT_DIR.iterdir():
-            if path.is_file():
-                zf.write(path, arcname=path.name)
-
     print("\nResumo:")
     print(f"  Arquivos copiados: {copied}")
     print(f"  ZIP criado em:     {ZIP_PATH.resolve()}")
@@ -1,139 +1,349 @@
-﻿import sys
+﻿import os
+import sys
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-import hashlib
 import sqlite3
+from typing import Callable, Iterable, Iterator, NamedTuple
 
-from ace.data_model.db import get_connection, DB_PATH
+from ace.data_model.db import get_connection, get_file_hash_algorithm, migrate_columns, DB_PATH
+from ace.utils.hashing import get_file_hasher, hash_file
 
 
-def hash_file(path: Path) -> str:
+def iter_pdfs(root: Path) -> Iterator[Path]:
     """
-    Calcula SHA256 de um arquivo em chunks.
+    Percorre root recursivamente com os.scandir, devolvendo os PDFs à medida
+    que são encontrados (sem montar a lista inteira antes de começar).
+    Assim como rglob, não segue links simbólicos de diretório.
     """
-    h = hashlib.sha256()
-    with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            if not chunk:
-                break
-            h.update(chunk)
-    return h.hexdigest()
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.lower().endswith(".pdf") and entry.is_file():
+                        yield Path(entry.path)
+        except OSError as e:
+            print(f"[WARN] Não foi possível listar {current}: {e}")
 
 
-def ingest_folder(root: Path, max_files: int | None = None) -> None:
+class FileInfo(NamedTuple):
+    file_hash: str
+    size: int
+    mtime_ns: int
+    # False quando o hash veio do banco (size + mtime inalterados)
+    hashed: bool
+
+
+# storage_path -> (file_size, file_mtime_ns, file_hash) já gravados em documents
+KnownHashes = dict[str, tuple[int, int, str]]
+
+
+def load_known_hashes(conn: sqlite3.Connection) -> KnownHashes:
+    rows = conn.execute(
+        """
+        SELECT storage_path, file_size, file_mtime_ns, file_hash
+          FROM documents
+         WHERE file_size IS NOT NULL
+           AND file_mtime_ns IS NOT NULL
+        """
+    )
+    return {r["storage_path"]: (r["file_size"], r["file_mtime_ns"], r["file_hash"]) for r in rows}
+
+
+def stat_and_hash(
+    path: Path, known: KnownHashes, hasher: Callable[[Path], str] = hash_file
+) -> FileInfo:
+    """
+    Reaproveita o hash do banco se size + mtime do arquivo não mudaram;
+    caso contrário calcula com hasher (o algoritmo do banco).
+    """
+    st = path.stat()
+    cached = known.get(str(path))
+    if cached is not None and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+        return FileInfo(cached[2], st.st_size, st.st_mtime_ns, hashed=False)
+    return FileInfo(hasher(path), st.st_size, st.st_mtime_ns, hashed=True)
+
+
+def iter_hashes(
+    pdf_paths: Iterable[Path],
+    known: KnownHashes | None = None,
+    hasher: Callable[[Path], str] = hash_file,
+    max_workers: int | None = None,
+) -> Iterator[tuple[Path, FileInfo | Exception]]:
+    """
+    Roda stat_and_hash em paralelo (threads: o hashlib libera o GIL no update),
+    devolvendo (path, FileInfo) na ordem de entrada. Em caso de erro de leitura,
+    o segundo item é a exceção.
+
+    Mantém no máximo max_workers * 4 arquivos em voo, então a memória fica
+    constante mesmo em pastas muito grandes.
+    """
+    known = known or {}
+    max_workers = max_workers or os.cpu_count() or 4
+    pending: deque[tuple[Path, Future]] = deque()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for pdf_path in pdf_paths:
+            pending.append((pdf_path, pool.submit(stat_and_hash, pdf_path, known, hasher)))
+            if len(pending) >= max_workers * 4:
+                path, fut = pending.popleft()
+                yield path, (fut.exception() or fut.result())
+        while pending:
+            path, fut = pending.popleft()
+            yield path, (fut.exception() or fut.result())
+
+
+# INSERT ... RETURNING existe a partir do SQLite 3.35
+HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Arquivos por transação: limita o tamanho do WAL e o retrabalho em caso de erro
+BATCH_SIZE = 500
+
+
+# SQL do laço de ingestão como constantes: o mesmo texto é reaproveitado pelo
+# cache de statements compilados da conexão (sqlite3 cacheia por string SQL).
+INSERT_DOC_SQL = """
+    INSERT OR IGNORE INTO documents (
+        file_hash, storage_path, doc_type, source_system, file_size, file_mtime_ns
+    )
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_DOC_RETURNING_SQL = """
+    INSERT INTO documents (
+        file_hash, storage_path, doc_type, source_system, file_size, file_mtime_ns
+    )
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(file_hash) DO NOTHING
+    RETURNING id
+"""
+
+SELECT_DOC_ID_SQL = "SELECT id FROM documents WHERE file_hash = ?"
+
+# Sempre BATCH_SIZE placeholders (completados com NULL, que não casa com nada),
+# para que todo lote use o mesmo statement já compilado.
+_IN_SLOTS = BATCH_SIZE
+SELECT_DOC_IDS_SQL = (
+    f"SELECT id, file_hash FROM documents WHERE file_hash IN ({','.join('?' * _IN_SLOTS)})"
+)
+
+# Certificates: um por document (por enquanto); client/project dummy, sem vendor
+INSERT_CERT_SQL = """
+    INSERT INTO certificates (
+        document_id,
+        client_id,
+        project_id,
+        vendor_id,
+        certificate_date,
+        certificate_status,
+        extraction_status
+    )
+    VALUES (?, 1, 1, NULL, NULL, 'NEW', 'PENDING')
+"""
+
+
+# Atualiza size/mtime de um document já existente (ex.: bancos anteriores à coluna)
+UPDATE_DOC_STAT_SQL = """
+    UPDATE documents
+       SET file_size = ?, file_mtime_ns = ?
+     WHERE file_hash = ? AND storage_path = ?
+"""
+
+
+def _ingest_batch(conn: sqlite3.Connection, batch: list[tuple[Path, FileInfo]]) -> tuple[int, int]:
+    """
+    Insere um lote de (pdf_path, FileInfo) numa única transação:
+    executemany em documents, um SELECT ... IN para os ids e executemany em certificates.
+
+    Retorna (novos documents, novos certificates). Propaga exceções para o
+    chamador decidir o fallback linha a linha.
+    """
+    before_changes = conn.total_changes
+    conn.executemany(
+        INSERT_DOC_SQL,
+        [
+            (info.file_hash, str(pdf_path), "COI_ACORD25", "BULK_IMPORT_GRAY", info.size, info.mtime_ns)
+            for pdf_path, info in batch
+        ],
+    )
+    new_documents = conn.total_changes - before_changes
+
+    conn.executemany(
+        UPDATE_DOC_STAT_SQL,
+        [(info.size, info.mtime_ns, info.file_hash, str(pdf_path)) for pdf_path, info in batch if info.hashed],
+    )
+
+    hashes = list({info.file_hash for _, info in batch})
+    id_by_hash = {
+        row["file_hash"]: row["id"]
+        for row in conn.execute(SELECT_DOC_IDS_SQL, hashes + [None] * (_IN_SLOTS - len(hashes)))
+    }
+
+    conn.executemany(INSERT_CERT_SQL, [(id_by_hash[info.file_hash],) for _, info in batch])
+    return new_documents, len(batch)
+
+
+def _ingest_one(conn: sqlite3.Connection, pdf_path: Path, info: FileInfo) -> tuple[int, int]:
+    """
+    Caminho linha a linha (fallback quando um lote falha).
+    Retorna (novos documents, novos certificates).
+    """
+    file_hash = info.file_hash
+    params = (file_hash, str(pdf_path), "COI_ACORD25", "BULK_IMPORT_GRAY", info.size, info.mtime_ns)
+
+    # 1) Documents: documento novo devolve o id no próprio INSERT (RETURNING)
+    row = None
+    if HAS_RETURNING:
+        row = conn.execute(INSERT_DOC_RETURNING_SQL, params).fetchone()
+    else:
+        before_changes = conn.total_changes
+        conn.execute(INSERT_DOC_SQL, params)
+        if conn.total_changes == before_changes:
+            row = None
+        else:
+            row = {"id": conn.execute("SELECT last_insert_rowid()").fetchone()[0]}
+    new_documents = 1 if row else 0
+
+    # 2) Já existia: busca o id pelo hash (só no caso de conflito)
+    if row is None:
+        if info.hashed:
+            conn.execute(UPDATE_DOC_STAT_SQL, (info.size, info.mtime_ns, file_hash, str(pdf_path)))
+        row = conn.execute(SELECT_DOC_ID_SQL, (file_hash,)).fetchone()
+
+    if not row:
+        raise LookupError(f"Não foi possível recuperar document_id (hash={file_hash})")
+
+    # 3) Certificates: um por document (por enquanto)
+    conn.execute(INSERT_CERT_SQL, (row["id"],))
+    return new_documents, 1
+
+
+def ingest_folder(root: Path, max_files: int | None = None, count_first: bool = False) -> None:
     """
     Varre a pasta root recursivamente, encontrando PDFs,
     e cria entries em documents + certificates.
 
     Mais robusto:
-      - sempre faz SELECT pra obter document_id
+      - grava em lotes de BATCH_SIZE, cada um numa transação explícita
+      - se um lote falhar, refaz só aquele lote linha a linha
       - não derruba ingestão inteira se um arquivo der erro
+      - pula o SHA-256 de arquivos já ingeridos com size + mtime inalterados
+      - a varredura é em streaming; count_first=True faz uma passada extra
+        só para mostrar o total de PDFs antes de começar
     """
     conn = get_connection()
     try:
         print(f"Usando banco em: {DB_PATH}")
         print(f"Iniciando ingestão a partir de: {root}")
 
-        pdf_paths = list(root.rglob("*.pdf"))
-        total_found = len(pdf_paths)
-        print(f"Encontrados {total_found} PDFs.")
+        total: int | str = "?"
+        if count_first:
+            total = sum(1 for _ in iter_pdfs(root))
+            print(f"Encontrados {total} PDFs.")
 
+        pdf_paths: Iterable[Path] = iter_pdfs(root)
         if max_files is not None:
-            pdf_paths = pdf_paths[:max_files]
+            pdf_paths = islice(pdf_paths, max_files)
             print(f"Limitando ingestão aos primeiros {max_files} arquivos.")
+            if count_first:
+                total = min(total, max_files)
 
         new_documents = 0
         new_certificates = 0
         skipped = 0
 
-        for idx, pdf_path in enumerate(pdf_paths, start=1):
-            pdf_path = pdf_path.resolve()
-            print(f"[{idx}/{len(pdf_paths)}] Ingerindo: {pdf_path}")
+        # Bancos criados antes de file_size/file_mtime_ns: adiciona as colunas
+        for column in migrate_columns(conn):
+            print(f"Migração: {column} adicionada.")
+        known = load_known_hashes(conn)
+        hash_algorithm = get_file_hash_algorithm(conn)
+        hasher = get_file_hasher(hash_algorithm)
+        print(f"Algoritmo de file_hash: {hash_algorithm}")
+        reused = 0
+        processed = 0
 
+        def flush(batch: list[tuple[Path, FileInfo]]) -> None:
+            nonlocal new_documents, new_certificates, skipped
+            if not batch:
+                return
             try:
-                file_hash = hash_file(pdf_path)
-
-                # 1) Documents: INSERT OR IGNORE
-                before_changes = conn.total_changes
-                conn.execute(
-                    """
-                    INSERT OR IGNORE INTO documents (file_hash, storage_path, doc_type, source_system)
-                    VALUES (?, ?, ?, ?)
-                    """,
-                    (file_hash, str(pdf_path), "COI_ACORD25", "BULK_IMPORT_GRAY"),
-                )
-                after_changes = conn.total_changes
-                if after_changes > before_changes:
-                    new_documents += 1
-
-                # 2) Buscar SEMPRE o id pelo hash
-                row = conn.execute(
-                    "SELECT id FROM documents WHERE file_hash = ?",
-                    (file_hash,),
-                ).fetchone()
-
-                if not row:
-                    print(f"[ERRO] Não foi possível recuperar document_id para {pdf_path} (hash={file_hash}). Pulando.")
-                    skipped += 1
-                    continue
-
-                document_id = row["id"]
-
-                # 3) Certificates: um por document (por enquanto)
-                conn.execute(
-                    """
-                    INSERT INTO certificates (
-                        document_id,
-                        client_id,
-                        project_id,
-                        vendor_id,
-                        certificate_date,
-                        certificate_status,
-                        extraction_status
-                    )
-                    VALUES (?, ?, ?, ?, NULL, 'NEW', 'PENDING')
-                    """,
-                    (
-                        document_id,
-                        1,   # client_id dummy
-                        1,   # project_id dummy
-                        None # vendor_id
-                    ),
-                )
-                new_certificates += 1
-
-            except sqlite3.IntegrityError as e:
-                # Não derruba tudo, só loga e segue
-                print(f"[ERRO] IntegrityError ao ingerir {pdf_path}: {e}. Pulando.")
-                skipped += 1
+                conn.execute("BEGIN IMMEDIATE")
+                docs, certs = _ingest_batch(conn, batch)
+                conn.commit()
+                new_documents += docs
+                new_certificates += certs
+                return
             except Exception as e:
-                print(f"[ERRO] Falha inesperada ao ingerir {pdf_path}: {e}. Pulando.")
+                conn.rollback()
+                print(f"[WARN] Lote de {len(batch)} arquivos falhou ({e}). Refazendo linha a linha.")
+
+            conn.execute("BEGIN IMMEDIATE")
+            for pdf_path, info in batch:
+                try:
+                    docs, certs = _ingest_one(conn, pdf_path, info)
+                    new_documents += docs
+                    new_certificates += certs
+                except sqlite3.IntegrityError as e:
+                    # Não derruba tudo, só loga e segue
+                    print(f"[ERRO] IntegrityError ao ingerir {pdf_path}: {e}. Pulando.")
+                    skipped += 1
+                except Exception as e:
+                    print(f"[ERRO] Falha inesperada ao ingerir {pdf_path}: {e}. Pulando.")
+                    skipped += 1
+            conn.commit()
+
+        batch: list[tuple[Path, FileInfo]] = []
+        resolved = (p.resolve() for p in pdf_paths)
+        for idx, (pdf_path, info) in enumerate(iter_hashes(resolved, known, hasher), start=1):
+            processed = idx
+            print(f"[{idx}/{total}] Ingerindo: {pdf_path}")
+
+            if isinstance(info, Exception):
+                print(f"[ERRO] Falha ao ler {pdf_path}: {info}. Pulando.")
                 skipped += 1
+                continue
+
+            if not info.hashed:
+                reused += 1
+            batch.append((pdf_path, info))
+
+            if len(batch) >= BATCH_SIZE:
+                flush(batch)
+                batch = []
 
-        conn.commit()
+        flush(batch)
         print("Ingestão concluída.")
+        print(f"PDFs processados: {processed}")
         print(f"Novos documents: {new_documents}")
         print(f"Novos certificates: {new_certificates}")
         print(f"Arquivos pulados por erro: {skipped}")
+        print(f"Hashes reaproveitados (size + mtime inalterados): {reused}")
 
     finally:
         conn.close()
 
 
 def main() -> None:
-    if len(sys.argv) < 2:
-        print("Uso: py scripts\\ingest_from_folder.py <caminho_da_pasta> [max_files]")
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if not args:
+        print("Uso: py scripts\\ingest_from_folder.py <caminho_da_pasta> [max_files] [--count]")
         raise SystemExit(1)
 
-    root = Path(sys.argv[1]).expanduser().resolve()
+    root = Path(args[0]).expanduser().resolve()
     if not root.exists():
         print(f"Pasta não encontrada: {root}")
         raise SystemExit(1)
 
     max_files = None
-    if len(sys.argv) >= 3:
-        max_files = int(sys.argv[2])
+    if len(args) >= 2:
+        max_files = int(args[1])
 
-    ingest_folder(root, max_files=max_files)
+    ingest_folder(root, max_files=max_files, count_first="--count" in sys.argv[1:])
 
 
 if __name__ == "__main__":
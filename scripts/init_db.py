@@ -1,12 +1,24 @@
-﻿from ace.data_model.db import get_connection, DB_PATH
+﻿import os
+import sqlite3
+
+from ace.data_model.db import get_connection, migrate_columns, DB_PATH
+from ace.utils.hashing import DEFAULT_FILE_HASH_ALGORITHM, get_file_hasher
 
 SCHEMA_SQL = """
+-- configurações fixas do banco (ex.: file_hash_algorithm)
+CREATE TABLE IF NOT EXISTS ace_meta (
+    key     TEXT PRIMARY KEY,
+    value   TEXT NOT NULL
+);
+
 CREATE TABLE IF NOT EXISTS documents (
     id              INTEGER PRIMARY KEY AUTOINCREMENT,
-    file_hash       TEXT NOT NULL,
+    file_hash       TEXT NOT NULL,  -- chave de dedup; algoritmo em ace_meta.file_hash_algorithm
     storage_path    TEXT NOT NULL,
     doc_type        TEXT NOT NULL,
     source_system   TEXT,
+    file_size       INTEGER,
+    file_mtime_ns   INTEGER,
     created_at      TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
     UNIQUE(file_hash)
 );
@@ -154,14 +166,63 @@ CREATE TABLE IF NOT EXISTS compliance_evaluation (
     FOREIGN KEY (certificate_id) REFERENCES certificates(id),
     FOREIGN KEY (requirement_id) REFERENCES coverage_requirements(id)
 );
+
+-- fila de extração: filtro por status + ORDER BY id cobertos pelo índice
+CREATE INDEX IF NOT EXISTS idx_certificates_extraction_status ON certificates(extraction_status, id);
+CREATE INDEX IF NOT EXISTS idx_certificates_document_id ON certificates(document_id);
+-- (certificate_id, lob_code) e (policy_id, coverage_code, limites): joins GL resolvidos só
+-- pelo índice (o rowid/id já vem em toda entrada; SQLite não tem INCLUDE, então os limites
+-- entram como colunas finais); substituem os índices menores, que viram prefixos redundantes
+DROP INDEX IF EXISTS idx_policies_certificate_id;
+DROP INDEX IF EXISTS idx_coverages_policy_id;
+DROP INDEX IF EXISTS idx_coverages_policy_code;
+CREATE INDEX IF NOT EXISTS idx_policies_cert_lob ON policies(certificate_id, lob_code);
+CREATE INDEX IF NOT EXISTS idx_coverages_policy_code_limits
+    ON coverages(policy_id, coverage_code, limit_amount, limit_currency);
 """
 
 
+def _is_empty(conn) -> bool:
+    return conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0] == 0
+
+
 def init_db() -> None:
     print(f"Usando banco em: {DB_PATH}")
+    # O algoritmo do file_hash só pode ser escolhido na criação do banco
+    # (ACE_FILE_HASH_ALGORITHM, ex.: xxh3_128); bancos existentes seguem em SHA-256.
+    # Validado antes de abrir o banco: nome inválido ou pacote ausente não
+    # deixam para trás um schema sem ace_meta (que depois viraria SHA-256).
+    requested_algorithm = os.environ.get("ACE_FILE_HASH_ALGORITHM", DEFAULT_FILE_HASH_ALGORITHM)
+    get_file_hasher(requested_algorithm)
+
     conn = get_connection()
     try:
-        conn.executescript(SCHEMA_SQL)
+        is_new = _is_empty(conn)
+        if is_new:
+            # Banco novo: monta o schema em memória e copia tudo de uma vez
+            # (backup API), em vez de um commit/fsync por CREATE.
+            # Só em banco vazio: o backup sobrescreve o destino inteiro.
+            mem = sqlite3.connect(":memory:")
+            try:
+                mem.executescript(SCHEMA_SQL)
+                mem.backup(conn)
+            finally:
+                mem.close()
+        else:
+            conn.executescript(SCHEMA_SQL)
+            for column in migrate_columns(conn):
+                print(f"Migração: {column} adicionada.")
+
+        # WAL fica gravado no arquivo do banco: vale para todas as conexões futuras
+        mode = conn.execute("PRAGMA journal_mode = WAL;").fetchone()[0]
+        print(f"journal_mode: {mode}")
+
+        algorithm = requested_algorithm if is_new else DEFAULT_FILE_HASH_ALGORITHM
+        conn.execute(
+            "INSERT OR IGNORE INTO ace_meta (key, value) VALUES ('file_hash_algorithm', ?)",
+            (algorithm,),
+        )
+
         conn.commit()
         print("Schema criado/atualizado com sucesso.")
     finally:
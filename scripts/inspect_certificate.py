@@ -1,4 +1,6 @@
 ﻿import sys
+from itertools import groupby
+from operator import itemgetter
 
 from ace.data_model.db import get_connection, DB_PATH
 
@@ -30,37 +32,34 @@ def inspect_certificate(certificate_id: int) -> None:
         print()
 
         print("Policies:")
-        policies = conn.execute(
+        # policies + coverages numa única consulta; agrupamos por policy em Python
+        rows = conn.execute(
             """
-            SELECT id, lob_code, carrier_name, policy_number,
-                   effective_date, expiration_date
-            FROM policies
-            WHERE certificate_id = ?
-            ORDER BY id
+            SELECT p.id AS pid, p.lob_code, p.carrier_name, p.policy_number,
+                   p.effective_date, p.expiration_date,
+                   c.coverage_code, c.limit_amount, c.limit_currency
+            FROM policies p
+            LEFT JOIN coverages c ON c.policy_id = p.id
+            WHERE p.certificate_id = ?
+            ORDER BY p.id, c.coverage_code
             """,
             (certificate_id,),
         ).fetchall()
 
-        if not policies:
+        if not rows:
             print("  (nenhuma policy)")
             return
 
-        for p in policies:
-            print(f"  Policy {p['id']} [{p['lob_code']}]")
+        for _, group in groupby(rows, key=itemgetter("pid")):
+            group = list(group)
+            p = group[0]
+            print(f"  Policy {p['pid']} [{p['lob_code']}]")
             print(f"    carrier: {p['carrier_name']}")
             print(f"    policy_number: {p['policy_number']}")
             print(f"    effective: {p['effective_date']}  expiration: {p['expiration_date']}")
 
-            covs = conn.execute(
-                """
-                SELECT coverage_code, limit_amount, limit_currency
-                FROM coverages
-                WHERE policy_id = ?
-                ORDER BY coverage_code
-                """,
-                (p["id"],),
-            ).fetchall()
-
+            # LEFT JOIN: policy sem coverage vem com uma linha de coverage_code NULL
+            covs = [c for c in group if c["coverage_code"] is not None]
             if not covs:
                 print("    coverages: (nenhuma)")
             else:
@@ -9,38 +9,55 @@ def main() -> None:
         print(f"Arquivo não encontrado: {PATH}")
         return
 
+    # contar quantas linhas têm cada campo não vazio
+    fields_to_check = [
+        "policy_number",
+        "effective_date",
+        "expiration_date",
+        "gl_aggregate",
+        "gl_each_occurrence",
+        "_parse_error",
+        "_llm_error",
+    ]
+
+    # passada única: contagens + 3 primeiras linhas, sem materializar o CSV
+    total = 0
+    samples = []
+    field_counts = Counter()
+    # csv.reader + índices resolvidos uma vez: sem um dict por linha
     with open(PATH, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
+        reader = csv.reader(f)
+        header = next(reader, [])
+        width = len(header)
+        idx = [(field, header.index(field)) for field in fields_to_check if field in header]
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < width:
+                row.extend([""] * (width - len(row)))
+            total += 1
+            if len(samples) < 3:
+                samples.append(dict(zip(header, row)))
+            for field, i in idx:
+                if row[i].strip():
+                    field_counts[field] += 1
 
     print(f"Arquivo: {PATH}")
-    print(f"Total de linhas: {len(rows)}")
+    print(f"Total de linhas: {total}")
     print("\nCampos (headers):")
-    print(", ".join(reader.fieldnames or []))
+    print(", ".join(header))
 
     # mostrar primeiras 3 linhas pra entender o formato
     print("\n=== Amostra das 3 primeiras linhas ===")
-    for row in rows[:3]:
+    for row in samples:
         print("---")
         for k, v in row.items():
             if v:
                 print(f"{k}: {v}")
 
-    # contar quantas linhas têm cada campo não vazio
-    fields_to_check = [
-        "policy_number",
-        "effective_date",
-        "expiration_date",
-        "gl_aggregate",
-        "gl_each_occurrence",
-        "_parse_error",
-        "_llm_error",
-    ]
-
     print("\n=== Presença de campos ===")
     for field in fields_to_check:
-        cnt = sum(1 for r in rows if (r.get(field) or "").strip())
-        print(f"{field}: {cnt} linhas com valor")
+        print(f"{field}: {field_counts[field]} linhas com valor")
 
 if __name__ == "__main__":
     main()
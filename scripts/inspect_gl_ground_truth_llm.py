@@ -1,5 +1,6 @@
 ﻿import csv
 import os
+from collections import Counter
 
 GROUND_TRUTH_PATH = os.path.join("db", "gl_ground_truth.csv")
 
@@ -28,39 +29,59 @@ def main() -> None:
     if not os.path.exists(GROUND_TRUTH_PATH):
         raise FileNotFoundError(f"Arquivo não encontrado: {GROUND_TRUTH_PATH}")
 
+    # passada única: contadores + até 3 linhas "OK", sem materializar o CSV
+    total = 0
+    fill_counts = Counter()
+    clean_count = 0
+    clean_samples = []
+    # csv.reader + índices resolvidos uma vez: sem um dict por linha
     with open(GROUND_TRUTH_PATH, newline="", encoding="utf-8") as f:
-        rows = list(csv.DictReader(f))
+        reader = csv.reader(f)
+        headers = next(reader, [])
+        width = len(headers)
+        # interseções com o header resolvidas uma vez, fora do laço
+        header_set = set(headers)
+        main_present = [(f, headers.index(f)) for f in MAIN_FIELDS if f in header_set]
+        error_present = [(e, headers.index(e)) for e in ERROR_FIELDS if e in header_set]
+        counted = main_present + error_present
+        error_idx = [i for _, i in error_present]
+        for r in reader:
+            if not r:
+                continue
+            if len(r) < width:
+                r.extend([""] * (width - len(r)))
+            total += 1
+            for field, i in counted:
+                if is_filled(r[i]):
+                    fill_counts[field] += 1
+            if not any(is_filled(r[i]) for i in error_idx):
+                clean_count += 1
+                if len(clean_samples) < 3:
+                    clean_samples.append(dict(zip(headers, r)))
 
-    total = len(rows)
     print(f"Arquivo: {GROUND_TRUTH_PATH}")
     print(f"Total de linhas (certificados): {total}")
     print()
 
     # Contar erros
     for ef in ERROR_FIELDS:
-        if ef in rows[0].keys():
-            count_err = sum(1 for r in rows if is_filled(r.get(ef)))
-            print(f"{ef}: {count_err} linhas com valor")
+        if ef in header_set:
+            print(f"{ef}: {fill_counts[ef]} linhas com valor")
     print()
 
     # Cobertura por campo principal
     print("=== Cobertura por campo (não-nulos) ===")
     for field in MAIN_FIELDS:
-        if field not in rows[0].keys():
+        if field not in header_set:
             print(f"{field}: NÃO ENCONTRADO NO CSV")
             continue
-        count_nonnull = sum(1 for r in rows if is_filled(r.get(field)))
-        print(f"{field:18s}: {count_nonnull:4d} / {total}")
+        print(f"{field:18s}: {fill_counts[field]:4d} / {total}")
 
     print("\n=== Amostras de linhas sem erro de LLM/parse ===")
-    clean_rows = [
-        r for r in rows
-        if not any(is_filled(r.get(e)) for e in ERROR_FIELDS if e in r)
-    ]
-    print(f"Linhas consideradas 'OK' (sem _llm_error/_parse_error): {len(clean_rows)}\n")
+    print(f"Linhas consideradas 'OK' (sem _llm_error/_parse_error): {clean_count}\n")
 
     # Mostrar até 3 exemplos
-    for sample in clean_rows[:3]:
+    for sample in clean_samples:
         cid = sample.get("certificate_id") or sample.get("id") or "N/A"
         print(f"certificate_id: {cid}")
         for field in MAIN_FIELDS:
@@ -68,6 +89,5 @@ def main() -> None:
                 print(f"  {field}: {sample[field]}")
         print("-" * 40)
 
-
 if __name__ == "__main__":
     main()
@@ -4,17 +4,52 @@ import os
 import sys
 import sqlite3
 import textwrap
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Caminhos principais
 DB_PATH = os.path.join("db", "ace.sqlite")
 SAMPLES_PATH = os.path.join("db", "oracle_samples_gl.csv")
+# preenchida por create_oracle_samples_gl_from_db.py --emit-sqlite
+SAMPLE_TABLE = "oracle_sample_certificates"
 OUTPUT_PATH = os.path.join("db", "gl_ground_truth.csv")
+# texto extraído por PDF, chaveado pelo SHA-256 do arquivo
+PDF_TEXT_CACHE_DIR = os.path.join("db", "pdf_text_cache")
+# resposta do LLM por documento: <documents.file_hash>_<modelo>_<PROMPT_VERSION>.json
+LLM_CACHE_DIR = os.path.join("db", "llm_cache")
+# incrementar ao mudar o prompt de call_llm, para invalidar o cache de respostas
+PROMPT_VERSION = "gl-v1"
+DEFAULT_MODEL = "claude-sonnet-4-5-20250929"
 
 API_URL = "https://api.anthropic.com/v1/messages"
 
+# Sessão compartilhada: keep-alive entre chamadas (evita handshake TLS por request),
+# pool dimensionado para as threads de main() e retry em 429/5xx.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset({"POST"}),
+        ),
+    ),
+)
+_SESSION.headers.update(
+    {
+        "anthropic-version": "2023-06-01",
+        "content-type": "application/json",
+    }
+)
+
 
 def get_db_connection() -> sqlite3.Connection:
     return sqlite3.connect(DB_PATH)
@@ -24,8 +59,9 @@ def load_sample_ids(limit: int | None = None) -> list[int]:
     if not os.path.exists(SAMPLES_PATH):
         raise FileNotFoundError(f"Arquivo de amostra não encontrado: {SAMPLES_PATH}")
 
-    with open(SAMPLES_PATH, newline="", encoding="utf-8") as f:
-        rows = list(csv.DictReader(f))
+    # NUL bytes quebram o módulo csv ("line contains NUL"), então filtramos na leitura
+    with open(SAMPLES_PATH, newline="", encoding="utf-8", errors="replace") as f:
+        rows = list(csv.DictReader(line.replace("\x00", "") for line in f))
 
     ids: list[int] = []
     for r in rows:
@@ -42,40 +78,107 @@ def load_sample_ids(limit: int | None = None) -> list[int]:
     return ids
 
 
-def get_storage_path(conn: sqlite3.Connection, cert_id: int) -> str:
+def load_sample_ids_from_db(conn: sqlite3.Connection, limit: int | None = None) -> list[int]:
+    sql = f"""
+        SELECT s.certificate_id
+          FROM {SAMPLE_TABLE} s
+          JOIN certificates c ON c.id = s.certificate_id
+         ORDER BY s.certificate_id
+    """
+    params: tuple = ()
+    if limit is not None:
+        sql += " LIMIT ?"
+        params = (limit,)
+    return [cid for (cid,) in conn.execute(sql, params)]
+
+
+def get_document_info(conn: sqlite3.Connection, cert_id: int) -> Tuple[str, str]:
+    """Retorna (storage_path, file_hash) do documento do certificado."""
     cur = conn.cursor()
-    cur.execute("SELECT storage_path FROM certificates WHERE id = ?", (cert_id,))
+    cur.execute(
+        """
+        SELECT d.storage_path, d.file_hash
+          FROM certificates c
+          JOIN documents d ON d.id = c.document_id
+         WHERE c.id = ?
+        """,
+        (cert_id,),
+    )
     row = cur.fetchone()
     if not row or not row[0]:
         raise RuntimeError(f"Sem storage_path para certificate_id={cert_id}")
     path = row[0]
     if not os.path.isabs(path):
         path = os.path.join(os.getcwd(), path)
-    return path
+    return path, row[1]
 
 
 # Reaproveita o mesmo extrator usado no ACE
-from ace.extraction.layout import extract_text_from_pdf
+from ace.extraction.layout import PageText, extract_text_from_pdf
+from ace.utils.atomic import atomic_write
+from ace.utils.hashing import hash_file
 
 
 def get_pdf_text(path: str) -> str:
-    pages: List[str] = extract_text_from_pdf(path)
+    pages: List[PageText] = extract_text_from_pdf(path)
     if not pages:
         raise RuntimeError("Nenhum texto retornado pelo OCR/layout")
 
     # ACORD 25 costuma ser 1 página; para segurança, usamos no máximo 2
-    text = "\n\n".join(pages[:2])
+    text = "\n\n".join(p.text for p in pages[:2])
     text = text.replace("\x00", "")
     return text
 
 
+def get_pdf_text_cached(path: str) -> str:
+    """
+    get_pdf_text com cache em disco (PDF_TEXT_CACHE_DIR/<sha256>.txt).
+    Re-execuções do oráculo (ex.: iterando o prompt) não reextraem o PDF.
+    """
+    cache_path = os.path.join(PDF_TEXT_CACHE_DIR, f"{hash_file(path)}.txt")
+    if os.path.exists(cache_path):
+        with open(cache_path, encoding="utf-8") as f:
+            return f.read()
+
+    text = get_pdf_text(path)
+    # escrita atômica: threads podem gravar a mesma chave
+    with atomic_write(cache_path) as f:
+        f.write(text)
+    return text
+
+
+def get_model() -> str:
+    # Modelo configurável; default para o Sonnet 4.5 que você pediu
+    return os.environ.get("ACE_ANTHROPIC_MODEL", DEFAULT_MODEL)
+
+
+def _llm_cache_path(file_hash: str) -> str:
+    return os.path.join(LLM_CACHE_DIR, f"{file_hash}_{get_model()}_{PROMPT_VERSION}.json")
+
+
+def load_llm_cache(file_hash: str) -> Optional[Dict[str, Any]]:
+    """Resposta já obtida para este conteúdo de PDF (mesmo modelo e prompt)."""
+    path = _llm_cache_path(file_hash)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_llm_cache(file_hash: str, obj: Dict[str, Any]) -> None:
+    with atomic_write(_llm_cache_path(file_hash)) as f:
+        json.dump(obj, f, ensure_ascii=False)
+
+
 def call_llm(text: str, certificate_id: int) -> Dict[str, Any]:
     api_key = os.environ.get("ANTHROPIC_API_KEY")
     if not api_key:
         raise RuntimeError("ANTHROPIC_API_KEY não configurada no ambiente")
 
-    # Modelo configurável; default para o Sonnet 4.5 que você pediu
-    model = os.environ.get("ACE_ANTHROPIC_MODEL", "claude-sonnet-4-5-20250929")
+    model = get_model()
 
     system_prompt = (
         "Você é um especialista em seguros P&C dos EUA e em leitura de Certificates "
@@ -117,13 +220,7 @@ def call_llm(text: str, certificate_id: int) -> Dict[str, Any]:
         ],
     }
 
-    headers = {
-        "x-api-key": api_key,
-        "anthropic-version": "2023-06-01",
-        "content-type": "application/json",
-    }
-
-    resp = requests.post(API_URL, headers=headers, json=payload, timeout=90)
+    resp = _SESSION.post(API_URL, headers={"x-api-key": api_key}, json=payload, timeout=90)
     resp.raise_for_status()
     data = resp.json()
 
@@ -139,71 +236,139 @@ def call_llm(text: str, certificate_id: int) -> Dict[str, Any]:
         raise RuntimeError(f"Falha ao parsear JSON: {e}. Resposta bruta: {content[:400]!r}")
 
 
+# Campos devolvidos pelo LLM que copiamos para o CSV
+LLM_FIELDS = [
+    "policy_number",
+    "effective_date",
+    "expiration_date",
+    "gl_aggregate",
+    "gl_each_occurrence",
+    "notes",
+]
+
+FIELDNAMES = ["certificate_id"] + LLM_FIELDS + ["_llm_error", "_parse_error"]
+
+
+def resolve_documents(conn: sqlite3.Connection, cert_ids: List[int]) -> Dict[int, Any]:
+    """
+    Resolve (storage_path, file_hash) de todos os certificados na thread
+    principal (conexões sqlite3 não são compartilháveis entre threads).
+    Em caso de erro, o valor é a exceção.
+    """
+    docs: Dict[int, Any] = {}
+    for cert_id in cert_ids:
+        try:
+            docs[cert_id] = get_document_info(conn, cert_id)
+        except Exception as e:
+            docs[cert_id] = e
+    return docs
+
+
+def process_one(cert_id: int, doc: Any) -> Dict[str, Any]:
+    """
+    Extrai o texto do PDF e chama o LLM para um certificado.
+    Se o mesmo conteúdo (file_hash) já foi respondido pelo LLM, reaproveita
+    a resposta em cache sem reler o PDF.
+    Erros ficam registrados em _parse_error/_llm_error, nunca propagam.
+    """
+    row_out: Dict[str, Any] = {
+        "certificate_id": cert_id,
+        "policy_number": None,
+        "effective_date": None,
+        "expiration_date": None,
+        "gl_aggregate": None,
+        "gl_each_occurrence": None,
+        "notes": "",
+        "_llm_error": "",
+        "_parse_error": "",
+    }
+
+    if isinstance(doc, Exception):
+        row_out["_parse_error"] = f"Erro ao carregar/ler PDF: {doc}"
+        return row_out
+    pdf_path, file_hash = doc
+
+    llm_obj = load_llm_cache(file_hash)
+    if llm_obj is not None:
+        for key in LLM_FIELDS:
+            if key in llm_obj:
+                row_out[key] = llm_obj[key]
+        return row_out
+
+    # 1) Carregar PDF e extrair texto
+    try:
+        text = get_pdf_text_cached(pdf_path)
+    except Exception as e:
+        row_out["_parse_error"] = f"Erro ao carregar/ler PDF: {e}"
+        return row_out
+
+    # 2) Chamar o LLM
+    try:
+        llm_obj = call_llm(text, cert_id)
+        save_llm_cache(file_hash, llm_obj)
+        for key in LLM_FIELDS:
+            if key in llm_obj:
+                row_out[key] = llm_obj[key]
+    except Exception as e:
+        row_out["_llm_error"] = str(e)
+
+    return row_out
+
+
 def main() -> None:
-    sample_size = int(sys.argv[1]) if len(sys.argv) >= 2 else None
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    sample_size = int(args[0]) if args else None
+
+    with get_db_connection() as conn:
+        if "--from-sqlite" in sys.argv[1:]:
+            cert_ids = load_sample_ids_from_db(conn, sample_size)
+        else:
+            cert_ids = load_sample_ids(sample_size)
+        docs = resolve_documents(conn, cert_ids)
+
+    # Certificados com o mesmo PDF (file_hash) geram uma única chamada ao LLM;
+    # os demais recebem cópia da linha do representante.
+    siblings: Dict[int, List[int]] = {}
+    first_by_hash: Dict[str, int] = {}
+    for cert_id in cert_ids:
+        doc = docs[cert_id]
+        if isinstance(doc, Exception):
+            siblings[cert_id] = []
+            continue
+        rep = first_by_hash.setdefault(doc[1], cert_id)
+        if rep == cert_id:
+            siblings[cert_id] = []
+        else:
+            siblings[rep].append(cert_id)
 
-    cert_ids = load_sample_ids(sample_size)
     print(f"Gerando ground truth GL para {len(cert_ids)} certificados...")
+    print(f"PDFs distintos a processar: {len(siblings)}")
     os.makedirs("db", exist_ok=True)
 
-    fieldnames = [
-        "certificate_id",
-        "policy_number",
-        "effective_date",
-        "expiration_date",
-        "gl_aggregate",
-        "gl_each_occurrence",
-        "notes",
-        "_llm_error",
-        "_parse_error",
-    ]
-
-    with open(OUTPUT_PATH, "w", newline="", encoding="utf-8") as f_out, get_db_connection() as conn:
-        writer = csv.DictWriter(f_out, fieldnames=fieldnames)
+    # Latência de rede domina: várias chamadas em paralelo, limitadas por env
+    max_workers = int(os.environ.get("ACE_LLM_CONCURRENCY", "8"))
+
+    with open(OUTPUT_PATH, "w", newline="", encoding="utf-8") as f_out:
+        writer = csv.DictWriter(f_out, fieldnames=FIELDNAMES)
         writer.writeheader()
 
         total = len(cert_ids)
-        for idx, cert_id in enumerate(cert_ids, start=1):
-            print(f"[{idx}/{total}] certificate_id={cert_id}...")
-
-            row_out: Dict[str, Any] = {
-                "certificate_id": cert_id,
-                "policy_number": None,
-                "effective_date": None,
-                "expiration_date": None,
-                "gl_aggregate": None,
-                "gl_each_occurrence": None,
-                "notes": "",
-                "_llm_error": "",
-                "_parse_error": "",
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(process_one, cert_id, docs[cert_id]): cert_id
+                for cert_id in siblings
             }
-
-            # 1) Carregar PDF e extrair texto
-            try:
-                pdf_path = get_storage_path(conn, cert_id)
-                text = get_pdf_text(pdf_path)
-            except Exception as e:
-                row_out["_parse_error"] = f"Erro ao carregar/ler PDF: {e}"
+            # linhas gravadas na ordem em que terminam
+            done = 0
+            for fut in as_completed(futures):
+                rep = futures[fut]
+                row_out = fut.result()
                 writer.writerow(row_out)
-                continue
-
-            # 2) Chamar o LLM
-            try:
-                llm_obj = call_llm(text, cert_id)
-                for key in [
-                    "policy_number",
-                    "effective_date",
-                    "expiration_date",
-                    "gl_aggregate",
-                    "gl_each_occurrence",
-                    "notes",
-                ]:
-                    if key in llm_obj:
-                        row_out[key] = llm_obj[key]
-            except Exception as e:
-                row_out["_llm_error"] = str(e)
-
-            writer.writerow(row_out)
+                for sibling in siblings[rep]:
+                    writer.writerow({**row_out, "certificate_id": sibling})
+                done += 1 + len(siblings[rep])
+                dup_note = f" (+{len(siblings[rep])} com o mesmo PDF)" if siblings[rep] else ""
+                print(f"[{done}/{total}] certificate_id={rep} concluído{dup_note}")
 
     print(f"Ground truth GL salvo em {OUTPUT_PATH}")
 
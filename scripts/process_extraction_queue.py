@@ -1,13 +1,32 @@
-﻿import sys
+﻿import multiprocessing
+import os
+import sys
 
 from ace.data_model.db import get_connection, DB_PATH
 from ace.extraction.runner import run_extraction_for_certificate
 
 
-def process_extraction_queue(batch_size: int = 10) -> None:
+# Reinicia cada worker após N certificados para conter vazamentos de memória do OCR
+MAX_TASKS_PER_CHILD = 50
+
+
+def _extract_one(cid: int) -> tuple[int, str | None]:
+    """
+    Worker do Pool: nunca propaga exceção (derrubaria o lote inteiro).
+    O runner abre a própria conexão SQLite dentro do processo.
+    """
+    try:
+        run_extraction_for_certificate(cid)
+        return cid, None
+    except Exception as e:
+        return cid, str(e)
+
+
+def process_extraction_queue(batch_size: int = 10, workers: int | None = None) -> None:
     """
     Pega um lote de certificates com extraction_status = 'PENDING'
-    e roda o pipeline de extração para cada um.
+    e roda o pipeline de extração em paralelo (um processo por núcleo,
+    ou ACE_EXTRACT_WORKERS).
     """
     conn = get_connection()
     try:
@@ -33,12 +52,15 @@ def process_extraction_queue(batch_size: int = 10) -> None:
 
     print(f"Processando {len(certificate_ids)} certificados: {certificate_ids}")
 
-    for cid in certificate_ids:
-        try:
-            run_extraction_for_certificate(cid)
-        except Exception as e:
-            # MVP: loga e continua
-            print(f"[ERRO] Falha ao extrair certificate {cid}: {e}")
+    if workers is None:
+        workers = int(os.environ.get("ACE_EXTRACT_WORKERS", os.cpu_count() or 1))
+    workers = max(1, min(workers, len(certificate_ids)))
+
+    with multiprocessing.Pool(processes=workers, maxtasksperchild=MAX_TASKS_PER_CHILD) as pool:
+        for cid, error in pool.imap_unordered(_extract_one, certificate_ids, chunksize=1):
+            if error is not None:
+                # MVP: loga e continua
+                print(f"[ERRO] Falha ao extrair certificate {cid}: {error}")
 
 
 def main() -> None:
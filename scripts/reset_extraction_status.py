@@ -1,4 +1,4 @@
-﻿from ace.data_model.db import get_connection, DB_PATH
+﻿from ace.data_model.db import chunked, get_connection, DB_PATH
 
 
 def reset_some_certificates_to_pending(limit: int = 5) -> None:
@@ -33,15 +33,19 @@ def reset_some_certificates_to_pending(limit: int = 5) -> None:
             print(f"  id={r['id']}  status_atual={r['extraction_status']}")
             ids.append(r["id"])
 
-        conn.executemany(
-            """
-            UPDATE certificates
-               SET extraction_status = 'PENDING'
-             WHERE id = ?
-            """,
-            [(cid,) for cid in ids],
-        )
-        conn.commit()
+        # uma transação para todos os lotes; UPDATE ... IN (...) por lote
+        conn.execute("BEGIN IMMEDIATE")
+        with conn:
+            for chunk in chunked(ids):
+                placeholders = ",".join("?" * len(chunk))
+                conn.execute(
+                    f"""
+                    UPDATE certificates
+                       SET extraction_status = 'PENDING'
+                     WHERE id IN ({placeholders})
+                    """,
+                    chunk,
+                )
         print(f"Resetados {len(ids)} certificates para PENDING.")
 
     finally:
@@ -1,4 +1,4 @@
-﻿from ace.data_model.db import get_connection, DB_PATH
+﻿from ace.data_model.db import chunked, get_connection, DB_PATH
 
 
 def reset_certificates(ids):
@@ -7,11 +7,15 @@ def reset_certificates(ids):
         print(f"Usando banco em: {DB_PATH}")
         print("Resetando certificates para PENDING:", ids)
 
-        conn.executemany(
-            "UPDATE certificates SET extraction_status = 'PENDING' WHERE id = ?",
-            [(cid,) for cid in ids],
-        )
-        conn.commit()
+        # uma transação para todos os lotes; UPDATE ... IN (...) por lote
+        conn.execute("BEGIN IMMEDIATE")
+        with conn:
+            for chunk in chunked(ids):
+                placeholders = ",".join("?" * len(chunk))
+                conn.execute(
+                    f"UPDATE certificates SET extraction_status = 'PENDING' WHERE id IN ({placeholders})",
+                    chunk,
+                )
         print("Done.")
     finally:
         conn.close()
@@ -1,20 +1,31 @@
 ﻿import csv
+import sys
 from pathlib import Path
 from typing import Optional
 
+from ace.utils.csv_io import CSV_READ_BUFFER_SIZE, iter_padded_rows, open_csv_for_scan
+
 ROOT = Path(__file__).resolve().parent.parent  # .../ACE/scripts -> /ACE
 DB_DIR = ROOT / "db"
 GL_EXPORT_PATH = DB_DIR / "gl_export.csv"
 GL_REQUIREMENTS_PATH = DB_DIR / "requirements_gl.csv"
 GL_COMPLIANCE_EXPORT_PATH = DB_DIR / "gl_compliance.csv"
+# linhas por certificado (--verbose) acumuladas e escritas em blocos
+OUTPUT_FLUSH_EVERY = 1024
 
 
 def _to_float(value: str) -> Optional[float]:
-    if value is None:
+    if not value:
         return None
     value = value.strip()
     if not value:
         return None
+    # caminho rápido: sinal opcional + dígitos com no máximo um ponto,
+    # sem passar pelo custo de uma exceção
+    body = value[1:] if value[0] in "+-" else value
+    if body.replace(".", "", 1).isdecimal():
+        return float(value)
+    # demais formatos aceitos por float() (1e6, 1_000, inf...) ou lixo
     try:
         return float(value)
     except ValueError:
@@ -47,7 +58,7 @@ def load_requirements() -> dict:
     return req
 
 
-def run():
+def run(verbose: bool = False):
     if not GL_EXPORT_PATH.exists():
         raise SystemExit(
             f"Arquivo de export GL não encontrado: {GL_EXPORT_PATH}\n"
@@ -62,28 +73,56 @@ def run():
         f"min_agg={req['min_agg']:.0f}\n"
     )
 
-    with GL_EXPORT_PATH.open(newline="", encoding="utf-8-sig") as f_in, \
-            GL_COMPLIANCE_EXPORT_PATH.open("w", newline="", encoding="utf-8") as f_out:
-        reader = csv.DictReader(f_in)
-        fieldnames = reader.fieldnames + ["gl_compliance_status", "gl_compliance_reason"]
-        writer = csv.DictWriter(f_out, fieldnames=fieldnames)
-        writer.writeheader()
+    min_each_occ = req["min_each_occ"]
+    min_agg = req["min_agg"]
+    # rótulos de violação não mudam entre linhas
+    each_occ_breach = f"EACH_OCC<{min_each_occ:.0f}"
+    agg_breach = f"AGG<{min_agg:.0f}"
+    # nome local: evita a busca no escopo global a cada célula
+    to_float = _to_float
+
+    # csv.reader + índices resolvidos uma vez: sem um dict por linha
+    # leitura sequencial com buffer grande + read-ahead; escrita com o mesmo buffer
+    with open_csv_for_scan(GL_EXPORT_PATH) as f_in, \
+            GL_COMPLIANCE_EXPORT_PATH.open(
+                "w", newline="", encoding="utf-8", buffering=CSV_READ_BUFFER_SIZE
+            ) as f_out:
+        reader = csv.reader(f_in)
+        header = next(reader, [])
+        width = len(header)
+        # "\n" fixo: mesmo arquivo em qualquer SO (o default do csv é "\r\n")
+        writer = csv.writer(f_out, quoting=csv.QUOTE_MINIMAL, lineterminator="\n")
+        writer.writerow(header + ["gl_compliance_status", "gl_compliance_reason"])
+
+        def col(name: str) -> Optional[int]:
+            return header.index(name) if name in header else None
+
+        idx_status = col("extraction_status")
+        idx_cert = col("certificate_id")
+        idx_each_occ = col("GL_EACH_OCC")
+        idx_agg = col("GL_AGGREGATE")
 
         total = 0
         ok = 0
         fail = 0
-
-        for row in reader:
+        out_buf = []
+        # lista de saída única, preenchida no lugar a cada linha
+        # (csv.writer copia os valores, então reutilizar é seguro)
+        row_out = [""] * (width + 2)
+
+        # linha sempre com a largura do cabeçalho: as duas colunas de
+        # compliance ficam alinhadas mesmo com linhas curtas/longas
+        for row in iter_padded_rows(reader, width, truncate=True):
             total += 1
-            status = (row.get("extraction_status") or "").upper()
-            cert_id = row.get("certificate_id")
+            status = row[idx_status].upper() if idx_status is not None else ""
+            cert_id = row[idx_cert] if idx_cert is not None else None
 
             if status != "SUCCESS":
                 comp_status = "NOT_EVALUATED"
                 reason = f"extraction_status={status}"
             else:
-                each_occ = _to_float(row.get("GL_EACH_OCC") or "")
-                agg = _to_float(row.get("GL_AGGREGATE") or "")
+                each_occ = to_float(row[idx_each_occ]) if idx_each_occ is not None else None
+                agg = to_float(row[idx_agg]) if idx_agg is not None else None
 
                 missing = []
                 if each_occ is None:
@@ -97,10 +136,10 @@ def run():
                     fail += 1
                 else:
                     breaches = []
-                    if each_occ < req["min_each_occ"]:
-                        breaches.append(f"EACH_OCC<{req['min_each_occ']:.0f}")
-                    if agg < req["min_agg"]:
-                        breaches.append(f"AGG<{req['min_agg']:.0f}")
+                    if each_occ < min_each_occ:
+                        breaches.append(each_occ_breach)
+                    if agg < min_agg:
+                        breaches.append(agg_breach)
 
                     if breaches:
                         comp_status = "NON_COMPLIANT"
@@ -111,11 +150,20 @@ def run():
                         reason = ""
                         ok += 1
 
-            row["gl_compliance_status"] = comp_status
-            row["gl_compliance_reason"] = reason
-            writer.writerow(row)
+            row_out[:width] = row
+            row_out[width] = comp_status
+            row_out[width + 1] = reason
+            writer.writerow(row_out)
+
+            if verbose:
+                out_buf.append(
+                    f"Certificate {cert_id}: {comp_status} {('- ' + reason) if reason else ''}\n"
+                )
+                if len(out_buf) >= OUTPUT_FLUSH_EVERY:
+                    sys.stdout.write("".join(out_buf))
+                    out_buf.clear()
 
-            print(f"Certificate {cert_id}: {comp_status} {('- ' + reason) if reason else ''}")
+        sys.stdout.write("".join(out_buf))
 
     print("\nResumo:")
     print(f"  Total analisados: {total}")
@@ -125,4 +173,4 @@ def run():
 
 
 if __name__ == "__main__":
-    run()
+    run(verbose="--verbose" in sys.argv[1:])
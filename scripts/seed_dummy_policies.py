@@ -16,64 +16,53 @@ def seed_dummy_gl_policy() -> None:
         certificate_id = get_any_certificate_id(conn)
         print(f"Usando certificate_id={certificate_id} para criar policy GL dummy.")
 
-        # 1) Insere policy GL
-        cur = conn.execute(
-            """
-            INSERT INTO policies (
-                certificate_id,
-                lob_code,
-                carrier_name,
-                policy_number,
-                effective_date,
-                expiration_date,
-                cancellation_notice_days,
-                source_method,
-                confidence_score
+        # policy + coverages em uma única transação
+        conn.execute("BEGIN IMMEDIATE")
+        with conn:
+            # 1) Insere policy GL
+            cur = conn.execute(
+                """
+                INSERT INTO policies (
+                    certificate_id,
+                    lob_code,
+                    carrier_name,
+                    policy_number,
+                    effective_date,
+                    expiration_date,
+                    cancellation_notice_days,
+                    source_method,
+                    confidence_score
+                )
+                VALUES (?, ?, ?, ?, date('now'), date('now','+1 year'), ?, 'PARSER', 1.0)
+                """,
+                (
+                    certificate_id,
+                    "GL",
+                    "DUMMY CARRIER",
+                    "POL-GL-123",
+                    30,  # cancellation_notice_days
+                ),
             )
-            VALUES (?, ?, ?, ?, date('now'), date('now','+1 year'), ?, 'PARSER', 1.0)
-            """,
-            (
-                certificate_id,
-                "GL",
-                "DUMMY CARRIER",
-                "POL-GL-123",
-                30,  # cancellation_notice_days
-            ),
-        )
-        policy_id = cur.lastrowid
+            policy_id = cur.lastrowid
 
-        # 2) Insere coverages GL (each occurrence e general aggregate)
-        conn.execute(
-            """
-            INSERT INTO coverages (
-                policy_id,
-                coverage_code,
-                limit_amount,
-                limit_currency,
-                source_method,
-                confidence_score
+            # 2) Insere coverages GL (each occurrence e general aggregate)
+            conn.executemany(
+                """
+                INSERT INTO coverages (
+                    policy_id,
+                    coverage_code,
+                    limit_amount,
+                    limit_currency,
+                    source_method,
+                    confidence_score
+                )
+                VALUES (?, ?, ?, 'USD', 'PARSER', 1.0)
+                """,
+                [
+                    (policy_id, "GL_EACH_OCC", 1_000_000.0),
+                    (policy_id, "GL_AGGREGATE", 2_000_000.0),
+                ],
             )
-            VALUES (?, ?, ?, 'USD', 'PARSER', 1.0)
-            """,
-            (policy_id, "GL_EACH_OCC", 1_000_000.0),
-        )
-
-        conn.execute(
-            """
-            INSERT INTO coverages (
-                policy_id,
-                coverage_code,
-                limit_amount,
-                limit_currency,
-                source_method,
-                confidence_score
-            )
-            VALUES (?, ?, ?, 'USD', 'PARSER', 1.0)
-            """,
-            (policy_id, "GL_AGGREGATE", 2_000_000.0),
-        )
-
-        conn.commit()
         print(f"Policy GL dummy criada com policy_id={policy_id}.")
     finally:
         conn.close()
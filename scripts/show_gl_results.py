@@ -1,4 +1,7 @@
-﻿from ace.data_model.db import get_connection, DB_PATH
+﻿from collections import defaultdict
+from operator import itemgetter
+
+from ace.data_model.db import chunked, get_readonly_connection, DB_PATH
 
 
 def show_gl_results(certificate_ids: list[int] | None = None, limit: int = 20) -> None:
@@ -9,7 +12,7 @@ def show_gl_results(certificate_ids: list[int] | None = None, limit: int = 20) -
       - metadados da policy GL (policy_number, datas)
       - coverages GL principais (todos os sub-limits mapeados)
     """
-    conn = get_connection()
+    conn = get_readonly_connection()
     try:
         print(f"Usando banco em: {DB_PATH}\n")
 
@@ -26,76 +29,97 @@ def show_gl_results(certificate_ids: list[int] | None = None, limit: int = 20) -
             ).fetchall()
             certificate_ids = [r["id"] for r in rows]
 
-        for cid in certificate_ids:
-            cert = conn.execute(
-                """
+        certs = {}
+        runs = {}
+        policies = {}
+        covs = defaultdict(list)
+        # 3 consultas por lote de ids em vez de 4 por certificado
+        for chunk in chunked(list(dict.fromkeys(certificate_ids))):
+            placeholders = ",".join("?" * len(chunk))
+
+            for row in conn.execute(
+                f"""
                 SELECT c.id,
                        c.extraction_status,
                        d.id AS document_id,
                        d.storage_path
                   FROM certificates c
                   JOIN documents d ON d.id = c.document_id
-                 WHERE c.id = ?
+                 WHERE c.id IN ({placeholders})
+                """,
+                chunk,
+            ):
+                certs[row["id"]] = row
+
+            # último extraction_run de cada documento
+            doc_ids = list({certs[cid]["document_id"] for cid in chunk if cid in certs})
+            if doc_ids:
+                doc_placeholders = ",".join("?" * len(doc_ids))
+                for row in conn.execute(
+                    f"""
+                    SELECT document_id, ocr_provider, status
+                      FROM extraction_runs
+                     WHERE id IN (
+                            SELECT MAX(id)
+                              FROM extraction_runs
+                             WHERE document_id IN ({doc_placeholders})
+                             GROUP BY document_id
+                     )
+                    """,
+                    doc_ids,
+                ):
+                    runs[row["document_id"]] = row
+
+            # Policies GL + coverages GL (todos códigos relevantes)
+            for row in conn.execute(
+                f"""
+                SELECT p.certificate_id,
+                       p.id AS policy_id,
+                       p.carrier_name,
+                       p.policy_number,
+                       p.effective_date,
+                       p.expiration_date,
+                       cv.coverage_code,
+                       cv.limit_amount,
+                       cv.limit_currency
+                  FROM policies p
+                  LEFT JOIN coverages cv
+                         ON cv.policy_id = p.id
+                        AND cv.coverage_code IN (
+                            'GL_EACH_OCC',
+                            'GL_AGGREGATE',
+                            'GL_PERS_ADV',
+                            'GL_PROD_AGG',
+                            'GL_DAMAGE_PREM',
+                            'GL_MED_EXP'
+                        )
+                 WHERE p.certificate_id IN ({placeholders})
+                   AND p.lob_code = 'GL'
+                 ORDER BY p.certificate_id, p.id
                 """,
-                (cid,),
-            ).fetchone()
+                chunk,
+            ):
+                cid = row["certificate_id"]
+                # Policy GL principal: a de menor id
+                policies.setdefault(cid, row)
+                if row["coverage_code"] is not None:
+                    covs[cid].append(row)
+
+        for cid in certificate_ids:
+            cert = certs.get(cid)
 
             if not cert:
                 print(f"Certificate {cid} não encontrado.")
                 print("-" * 60)
                 continue
 
-            er = conn.execute(
-                """
-                SELECT ocr_provider, status
-                  FROM extraction_runs
-                 WHERE document_id = ?
-                 ORDER BY id DESC
-                 LIMIT 1
-                """,
-                (cert["document_id"],),
-            ).fetchone()
+            er = runs.get(cert["document_id"])
 
             ocr_provider = er["ocr_provider"] if er else None
             run_status = er["status"] if er else None
 
-            # Policy GL principal
-            policy = conn.execute(
-                """
-                SELECT id,
-                       carrier_name,
-                       policy_number,
-                       effective_date,
-                       expiration_date
-                  FROM policies
-                 WHERE certificate_id = ?
-                   AND lob_code = 'GL'
-                 ORDER BY id
-                 LIMIT 1
-                """,
-                (cid,),
-            ).fetchone()
-
-            # Coverages GL (todos códigos relevantes)
-            covs = conn.execute(
-                """
-                SELECT cv.coverage_code, cv.limit_amount, cv.limit_currency
-                  FROM coverages cv
-                  JOIN policies p ON p.id = cv.policy_id
-                 WHERE p.certificate_id = ?
-                   AND p.lob_code = 'GL'
-                   AND cv.coverage_code IN (
-                        'GL_EACH_OCC',
-                        'GL_AGGREGATE',
-                        'GL_PERS_ADV',
-                        'GL_PROD_AGG',
-                        'GL_DAMAGE_PREM',
-                        'GL_MED_EXP'
-                   )
-                 ORDER BY cv.coverage_code
-                """,
-                (cid,),
-            ).fetchall()
+            policy = policies.get(cid)
+            cert_covs = sorted(covs.get(cid, ()), key=itemgetter("coverage_code"))
 
             print(f"Certificate {cert['id']}")
             print(f"  extraction_status: {cert['extraction_status']}")
@@ -111,11 +135,11 @@ def show_gl_results(certificate_ids: list[int] | None = None, limit: int = 20) -
             else:
                 print("  Policy GL: (nenhuma policy encontrada)")
 
-            if not covs:
+            if not cert_covs:
                 print("  GL coverages: (nenhuma encontrada)")
             else:
                 print("  GL coverages:")
-                for c in covs:
+                for c in cert_covs:
                     print(
                         f"    {c['coverage_code']}: {c['limit_amount']} {c['limit_currency']}"
                     )
@@ -127,6 +151,13 @@ def show_gl_results(certificate_ids: list[int] | None = None, limit: int = 20) -
 
 
 if __name__ == "__main__":
-    ids = [30, 31, 32, 33, 34]
-    show_gl_results(certificate_ids=ids)
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ids", default=None, help="certificate_ids separados por vírgula (ex: 30,31,32)")
+    parser.add_argument("--limit", type=int, default=20, help="Sem --ids: primeiros N certificates SUCCESS")
+
+    args = parser.parse_args()
+    ids = [int(x) for x in args.ids.split(",") if x.strip()] if args.ids else None
+    show_gl_results(certificate_ids=ids, limit=args.limit)
 
@@ -1,38 +1,42 @@
-﻿from ace.data_model.db import get_connection, DB_PATH
+﻿from ace.data_model.db import get_readonly_connection, DB_PATH
 
 
 def main() -> None:
-    conn = get_connection()
+    conn = get_readonly_connection()
     try:
         print(f"Usando banco em: {DB_PATH}\n")
 
-        # 1) Quantos certificados por status
+        # Uma consulta: status + total + GL ok (mesma policy GL com EACH_OCC e AGG)
         rows = conn.execute(
             """
-            SELECT extraction_status, COUNT(*) as total
-              FROM certificates
-             GROUP BY extraction_status
-             ORDER BY extraction_status
+            WITH gl AS (
+                SELECT DISTINCT p.certificate_id
+                  FROM policies p
+                  JOIN coverages cv ON cv.policy_id = p.id
+                 WHERE p.lob_code = 'GL'
+                   AND cv.coverage_code IN ('GL_EACH_OCC', 'GL_AGGREGATE')
+                 GROUP BY p.id
+                HAVING COUNT(DISTINCT cv.coverage_code) = 2
+            )
+            SELECT c.extraction_status,
+                   COUNT(*) AS total,
+                   COUNT(gl.certificate_id) AS gl_ok
+              FROM certificates c
+              LEFT JOIN gl ON gl.certificate_id = c.id
+             GROUP BY c.extraction_status
+             ORDER BY c.extraction_status
             """
         ).fetchall()
 
+        # 1) Quantos certificados por status
         print("== Certificates por extraction_status ==")
         for r in rows:
             print(f"  {r['extraction_status']}: {r['total']}")
         print()
 
         # 2) Quantos têm GL com EACH_OCC + AGG
-        total = conn.execute("SELECT COUNT(*) AS c FROM certificates").fetchone()["c"]
-
-        gl_ok = conn.execute(
-            """
-            SELECT COUNT(DISTINCT c.id) AS c
-              FROM certificates c
-              JOIN policies p ON p.certificate_id = c.id AND p.lob_code = 'GL'
-              JOIN coverages cv1 ON cv1.policy_id = p.id AND cv1.coverage_code = 'GL_EACH_OCC'
-              JOIN coverages cv2 ON cv2.policy_id = p.id AND cv2.coverage_code = 'GL_AGGREGATE'
-            """
-        ).fetchone()["c"]
+        total = sum(r["total"] for r in rows)
+        gl_ok = sum(r["gl_ok"] for r in rows)
 
         print("== Cobertura GL extraída (EACH_OCC + AGG) ==")
         print(f"  Certificates com GL (EACH_OCC & AGG): {gl_ok}")
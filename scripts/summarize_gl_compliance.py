@@ -2,6 +2,8 @@
 from collections import Counter
 from pathlib import Path
 
+from ace.utils.csv_io import column_getter, iter_padded_rows, open_csv_for_scan
+
 ROOT = Path(__file__).resolve().parent.parent  # .../ACE/scripts -> /ACE
 DB_DIR = ROOT / "db"
 GL_COMPLIANCE_EXPORT_PATH = DB_DIR / "gl_compliance.csv"
@@ -14,22 +16,29 @@ def run():
             f"Rode primeiro run_gl_compliance_from_csv.py."
         )
 
+    # csv.reader + índices resolvidos uma vez; uma única contagem de
+    # (status, motivo, projeto) no caminho rápido do Counter
+    with open_csv_for_scan(GL_COMPLIANCE_EXPORT_PATH) as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        get_status = column_getter(header, "gl_compliance_status")
+        get_reason = column_getter(header, "gl_compliance_reason")
+        get_project_name = column_getter(header, "project_name")
+        get_project = column_getter(header, "project")
+        keys = Counter(
+            (get_status(row).upper(), get_reason(row).strip(), get_project_name(row) or get_project(row))
+            for row in iter_padded_rows(reader, len(header))
+        )
+
     status_counter = Counter()
     reason_counter = Counter()
     not_evaluated_projects = Counter()
-
-    with GL_COMPLIANCE_EXPORT_PATH.open(newline="", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            status = (row.get("gl_compliance_status") or "").upper()
-            reason = (row.get("gl_compliance_reason") or "").strip()
-            project = row.get("project_name") or row.get("project") or ""
-
-            status_counter[status] += 1
-            if status == "NON_COMPLIANT" and reason:
-                reason_counter[reason] += 1
-            if status == "NOT_EVALUATED" and project:
-                not_evaluated_projects[project] += 1
+    for (status, reason, project), count in keys.items():
+        status_counter[status] += count
+        if status == "NON_COMPLIANT" and reason:
+            reason_counter[reason] += count
+        if status == "NOT_EVALUATED" and project:
+            not_evaluated_projects[project] += count
 
     print("=== GL Compliance Summary ===\n")
     print("Por status:")
@@ -2,6 +2,8 @@
 from collections import Counter
 from pathlib import Path
 
+from ace.utils.csv_io import column_getter, iter_padded_rows, open_csv_for_scan
+
 ROOT = Path(__file__).resolve().parent.parent
 DB_DIR = ROOT / "db"
 GL_EXPORT_PATH = DB_DIR / "gl_export.csv"
@@ -14,17 +16,24 @@ def run():
             f"Rode primeiro o script que gera gl_export.csv."
         )
 
+    # csv.reader + índices resolvidos uma vez; uma única contagem de
+    # (status, erro) no caminho rápido do Counter
+    with open_csv_for_scan(GL_EXPORT_PATH) as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        get_status = column_getter(header, "extraction_status")
+        get_error = column_getter(header, "extraction_error")
+        keys = Counter(
+            (get_status(row).upper(), get_error(row).strip())
+            for row in iter_padded_rows(reader, len(header))
+        )
+
     status_counter = Counter()
     error_counter = Counter()
-
-    with GL_EXPORT_PATH.open(newline="", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            status = (row.get("extraction_status") or "").upper()
-            error = (row.get("extraction_error") or "").strip()
-            status_counter[status] += 1
-            if error:
-                error_counter[error] += 1
+    for (status, error), count in keys.items():
+        status_counter[status] += count
+        if error:
+            error_counter[error] += count
 
     print("=== GL Extraction Summary ===\n")
     print("Por extraction_status:")
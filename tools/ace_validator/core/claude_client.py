@@ -5,9 +5,16 @@ VERSÃO CORRIGIDA: Suporta carregar .env automaticamente
 
 import os
 import json
-from typing import List, Dict, Optional
+import re
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 
+from .atomic import atomic_write
+
 # Tentar carregar .env se python-dotenv estiver disponível
 try:
     from dotenv import load_dotenv
@@ -15,6 +22,46 @@ try:
 except ImportError:
     pass  # python-dotenv não instalado, usa apenas os.getenv
 
+# orjson (opcional) decodifica as respostas da API 2-3x mais rápido
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Bloco JSON da resposta: do primeiro "{" ao último "}" (markdown em volta é ignorado)
+_JSON_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+# Cache em disco das respostas (opt-in com ACE_VALIDATOR_CACHE=1)
+_CACHE_DIR = Path.home() / ".cache" / "ace_validator"
+
+# Sessão HTTP compartilhada: reaproveita a conexão TLS entre chamadas
+_SESSION = None
+# Chamadas simultâneas em analyze_many (e conexões mantidas no pool da sessão)
+MAX_CONCURRENT_REQUESTS = 8
+# Novas tentativas em 429/529 (rate limit / sobrecarga), com espera exponencial
+MAX_RETRIES = 4
+_RETRY_STATUS = (429, 529)
+# Message Batches: metade do custo, resultado em até 24h
+BATCH_POLL_INTERVAL = 30  # segundos entre consultas ao status do lote
+
+
+def _get_session():
+    """Retorna a sessão requests do módulo (criada na primeira chamada)"""
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        _SESSION = requests.Session()
+        _SESSION.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=MAX_CONCURRENT_REQUESTS,
+                pool_maxsize=MAX_CONCURRENT_REQUESTS,
+            ),
+        )
+    return _SESSION
+
 
 @dataclass
 class AnalysisRequest:
@@ -44,6 +91,7 @@ class ClaudeClient:
         
         self.model = "claude-sonnet-4-20250514"
         self.base_url = "https://api.anthropic.com/v1/messages"
+        self.batches_url = f"{self.base_url}/batches"
     
     def analyze_code(self, request: AnalysisRequest) -> AnalysisResponse:
         """
@@ -64,6 +112,71 @@ class ClaudeClient:
         # Parseia resposta
         return self._parse_response(response)
     
+    def analyze_many(
+        self,
+        requests: List[AnalysisRequest],
+        max_workers: int = MAX_CONCURRENT_REQUESTS,
+    ) -> List[AnalysisResponse]:
+        """
+        Analisa várias requisições em paralelo
+        
+        Args:
+            requests: Requisições de análise
+            max_workers: Máximo de chamadas à API em andamento
+        
+        Returns:
+            Respostas na mesma ordem das requisições
+        """
+        if not requests:
+            return []
+        # cria a sessão antes das threads (evita duas sessões na corrida)
+        _get_session()
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(requests))) as pool:
+            return list(pool.map(self.analyze_code, requests))
+    
+    def suggest_improvements_many(
+        self,
+        files: List[Tuple[str, str]],
+        context: str,
+        max_workers: int = MAX_CONCURRENT_REQUESTS,
+    ) -> List[List[str]]:
+        """
+        Sugere melhorias para vários arquivos em paralelo
+        
+        Args:
+            files: Pares (caminho, código)
+            context: Contexto do ACE
+            max_workers: Máximo de chamadas à API em andamento
+        
+        Returns:
+            Listas de sugestões na mesma ordem dos arquivos
+        """
+        if not files:
+            return []
+        _get_session()
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(files))) as pool:
+            return list(pool.map(
+                lambda item: self.suggest_improvements(item[0], item[1], context),
+                files
+            ))
+    
+    def analyze_batch(
+        self,
+        requests: List[AnalysisRequest],
+        poll_interval: float = BATCH_POLL_INTERVAL,
+    ) -> List[Optional[AnalysisResponse]]:
+        """
+        Analisa várias requisições via Message Batches API (bloqueia até o lote terminar)
+        
+        Returns:
+            Respostas na mesma ordem das requisições (None se a requisição falhou)
+        """
+        texts = self._run_batch(
+            [self._build_analysis_prompt(request) for request in requests],
+            poll_interval=poll_interval,
+        )
+        return [self._parse_response(text) if text is not None else None for text in texts]
+    
     def validate_parser(self, parser_code: str, test_cases: List[Dict]) -> Dict:
         """
         Valida um parser específico
@@ -146,7 +259,96 @@ Analise o pipeline e retorne um JSON com:
         Returns:
             Lista de sugestões
         """
-        prompt = f"""
+        prompt = self._build_suggestions_prompt(file_path, code, context)
+        return self._parse_suggestions(self._call_api(prompt))
+    
+    def suggest_improvements_batch(
+        self,
+        files: List[Tuple[str, str]],
+        context: str,
+        poll_interval: float = BATCH_POLL_INTERVAL,
+    ) -> List[Optional[List[str]]]:
+        """
+        Sugere melhorias para vários arquivos via Message Batches API
+        
+        Returns:
+            Listas de sugestões na ordem dos arquivos (None se a requisição falhou)
+        """
+        texts = self._run_batch(
+            [self._build_suggestions_prompt(path, code, context) for path, code in files],
+            poll_interval=poll_interval,
+        )
+        return [self._parse_suggestions(text) if text is not None else None for text in texts]
+    
+    def submit_batch(self, prompts: List[str], max_tokens: int = 4000) -> str:
+        """
+        Envia os prompts como um lote (custom_id = posição na lista)
+        
+        Returns:
+            ID do lote
+        """
+        data = {
+            "requests": [
+                {
+                    "custom_id": f"req-{i}",
+                    "params": {
+                        "model": self.model,
+                        "max_tokens": max_tokens,
+                        "messages": [{"role": "user", "content": prompt}],
+                    },
+                }
+                for i, prompt in enumerate(prompts)
+            ]
+        }
+        response = _get_session().post(self.batches_url, headers=self._headers(), json=data)
+        response.raise_for_status()
+        return _json_loads(response.content)["id"]
+    
+    def wait_batch(self, batch_id: str, poll_interval: float = BATCH_POLL_INTERVAL) -> Dict:
+        """Consulta o lote até processing_status == "ended" e retorna o objeto do lote"""
+        while True:
+            response = _get_session().get(
+                f"{self.batches_url}/{batch_id}", headers=self._headers()
+            )
+            response.raise_for_status()
+            batch = _json_loads(response.content)
+            if batch["processing_status"] == "ended":
+                return batch
+            time.sleep(poll_interval)
+    
+    def batch_results(self, batch: Dict) -> Dict[str, Optional[str]]:
+        """
+        Lê os resultados (JSONL) de um lote encerrado
+        
+        Returns:
+            custom_id -> texto da resposta (None se errored/canceled/expired)
+        """
+        response = _get_session().get(batch["results_url"], headers=self._headers())
+        response.raise_for_status()
+        
+        results = {}
+        for line in response.content.splitlines():
+            if not line.strip():
+                continue
+            entry = _json_loads(line)
+            result = entry["result"]
+            results[entry["custom_id"]] = (
+                result["message"]["content"][0]["text"]
+                if result["type"] == "succeeded" else None
+            )
+        return results
+    
+    def _run_batch(self, prompts: List[str], poll_interval: float) -> List[Optional[str]]:
+        """Envia, espera e devolve os textos na ordem dos prompts"""
+        if not prompts:
+            return []
+        batch_id = self.submit_batch(prompts)
+        results = self.batch_results(self.wait_batch(batch_id, poll_interval))
+        return [results.get(f"req-{i}") for i in range(len(prompts))]
+    
+    def _build_suggestions_prompt(self, file_path: str, code: str, context: str) -> str:
+        """Constrói prompt de sugestões de melhoria"""
+        return f"""
 Arquivo: {file_path}
 
 Contexto: {context}
@@ -161,8 +363,9 @@ Foque em: clareza, performance, manutenibilidade, tratamento de erros.
 
 Retorne apenas uma lista em Markdown com - item por linha.
 """
-        
-        response = self._call_api(prompt)
+    
+    def _parse_suggestions(self, response: str) -> List[str]:
+        """Extrai os itens "- ..." da resposta"""
         lines = response.strip().split('\n')
         return [line.strip('- ').strip() for line in lines if line.strip().startswith('-')]
     
@@ -212,13 +415,11 @@ Retorne um JSON estruturado com:
         Returns:
             Texto da resposta
         """
-        import requests
+        cache_file = self._cache_file(prompt, max_tokens)
+        if cache_file is not None and cache_file.exists():
+            return cache_file.read_text(encoding="utf-8")
         
-        headers = {
-            "Content-Type": "application/json",
-            "x-api-key": self.api_key,
-            "anthropic-version": "2023-06-01"
-        }
+        headers = self._headers()
         
         data = {
             "model": self.model,
@@ -228,11 +429,52 @@ Retorne um JSON estruturado com:
             ]
         }
         
-        response = requests.post(self.base_url, headers=headers, json=data)
+        for attempt in range(MAX_RETRIES + 1):
+            response = _get_session().post(self.base_url, headers=headers, json=data)
+            if response.status_code not in _RETRY_STATUS or attempt == MAX_RETRIES:
+                break
+            time.sleep(self._retry_delay(response, attempt))
         response.raise_for_status()
         
-        result = response.json()
-        return result["content"][0]["text"]
+        # bytes direto para o parser, sem decodificar o corpo em str antes
+        result = _json_loads(response.content)
+        text = result["content"][0]["text"]
+        
+        if cache_file is not None:
+            self._write_cache(cache_file, text)
+        return text
+    
+    def _headers(self) -> Dict[str, str]:
+        """Cabeçalhos comuns das chamadas à API"""
+        return {
+            "Content-Type": "application/json",
+            "x-api-key": self.api_key,
+            "anthropic-version": "2023-06-01"
+        }
+    
+    @staticmethod
+    def _retry_delay(response, attempt: int) -> float:
+        """Espera antes da próxima tentativa: Retry-After se vier, senão 1, 2, 4... s"""
+        retry_after = response.headers.get("retry-after")
+        try:
+            return max(float(retry_after), 0.0)
+        except (TypeError, ValueError):
+            return float(2 ** attempt)
+    
+    def _cache_file(self, prompt: str, max_tokens: int) -> Optional[Path]:
+        """Arquivo de cache da chamada (None se o cache estiver desligado)"""
+        if os.getenv("ACE_VALIDATOR_CACHE") != "1":
+            return None
+        # modelo e max_tokens entram na chave: trocar o modelo invalida o cache
+        key = hashlib.sha256(
+            f"{self.model}\0{max_tokens}\0{prompt}".encode("utf-8")
+        ).hexdigest()
+        return _CACHE_DIR / f"{key}.txt"
+    
+    def _write_cache(self, cache_file: Path, text: str) -> None:
+        """Grava a resposta no cache (atômico entre execuções)"""
+        with atomic_write(cache_file) as f:
+            f.write(text)
     
     def _parse_response(self, response: str) -> AnalysisResponse:
         """Parseia resposta JSON do Claude"""
@@ -255,14 +497,10 @@ Retorne um JSON estruturado com:
     
     def _extract_json(self, text: str) -> str:
         """Extrai JSON de resposta que pode conter markdown"""
-        # Remove markdown code blocks
-        text = text.replace("```json", "").replace("```", "")
-        
-        # Procura por { ... }
-        start = text.find("{")
-        end = text.rfind("}") + 1
-        
-        if start >= 0 and end > start:
-            return text[start:end]
+        # Procura por { ... } (do primeiro "{" ao último "}") numa só varredura
+        match = _JSON_RE.search(text)
+        if match:
+            return match.group(0)
         
-        return text
+        # Remove markdown code blocks
+        return text.replace("```json", "").replace("```", "")
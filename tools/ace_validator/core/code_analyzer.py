@@ -4,9 +4,54 @@ Code Analyzer - Extrai contexto e metadados do cÃ³digo
 
 import os
 import ast
+import atexit
+import mmap
+import pickle
+import re
+from collections import deque
 from pathlib import Path
-from typing import List, Dict, Set
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import List, Dict, Set, Tuple, Optional
+from dataclasses import dataclass, field, replace
+
+from .atomic import atomic_write
+
+
+# Cache em disco de analyze_file: (caminho absoluto, mtime_ns, tamanho) -> FileInfo
+_ANALYZE_CACHE_FILE = Path.home() / ".cache" / "ace_validator" / "analyze_file.pkl"
+
+# Mudou a forma de extrair FileInfo? incremente para descartar o cache antigo
+_ANALYZE_CACHE_VERSION = 1
+
+# Cache do processo (compartilhado por todos os CodeAnalyzer), carregado sob
+# demanda; chaves novas desta execuÃ§Ã£o decidem se hÃ¡ o que gravar na saÃ­da
+_analyze_cache: Optional[Dict[Tuple[str, int, int], "FileInfo"]] = None
+_analyze_cache_new: Set[Tuple[str, int, int]] = set()
+
+# A partir de quantos arquivos nÃ£o cacheados o parse vai para processos
+PARALLEL_MIN_FILES = 50
+
+# Leituras simultÃ¢neas em extract_key_files (limita fds abertos)
+READ_MAX_WORKERS = 16
+
+# SÃ³ a AST; onde existir (3.13+), jÃ¡ otimizada: optimize=2 tira docstrings/asserts
+_AST_FLAGS = ast.PyCF_ONLY_AST | getattr(ast, "PyCF_OPTIMIZED_AST", 0)
+
+# Campos que guardam statements filhos (na ordem de _fields dos nÃ³s do ast)
+_STMT_FIELDS = ("body", "handlers", "orelse", "finalbody", "cases")
+
+# Caminho rÃ¡pido (sem AST): def/class/import no inÃ­cio da linha (com indentaÃ§Ã£o)
+_FAST_DEFS_RE = re.compile(
+    r'^[ \t]*(?:(def|class)[ \t]+(\w+)|import[ \t]+([^\n#;]+)|from[ \t]+\.*([\w.]*)[ \t]+import\b)',
+    re.M
+)
+
+# Por tipo de nÃ³, quais desses campos ele tem (preenchido na primeira vez que o tipo aparece)
+_STMT_FIELDS_BY_TYPE: Dict[type, Tuple[str, ...]] = {}
+
+# DiretÃ³rios ignorados na anÃ¡lise (podados na varredura, sem descer neles)
+EXCLUDE_DIRS = frozenset({'.venv', '__pycache__', '.git', 'venv', 'env'})
 
 
 @dataclass
@@ -30,6 +75,314 @@ class ProjectContext:
     modules: List[str]
     main_files: Dict[str, FileInfo]
     dependencies: Set[str]
+    # Todos os arquivos analisados: caminho relativo -> FileInfo (None se falhou)
+    files: Dict[str, Optional[FileInfo]] = field(default_factory=dict)
+
+
+def _glob_segment_to_regex(segment: str) -> str:
+    """Traduz um segmento de glob (sem "/") para regex: * e ? nÃ£o cruzam diretÃ³rios"""
+    out = []
+    i, n = 0, len(segment)
+    while i < n:
+        c = segment[i]
+        i += 1
+        if c == '*':
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '[':
+            j = segment.find(']', i + 1 if segment[i:i + 1] in ('!', ']') else i)
+            if j == -1:
+                out.append(re.escape(c))
+                continue
+            body = segment[i:j]
+            if body.startswith('!'):
+                body = '^' + body[1:]
+            out.append('[' + body.replace('\\', '\\\\') + ']')
+            i = j + 1
+        else:
+            out.append(re.escape(c))
+    return ''.join(out)
+
+
+@lru_cache(maxsize=32)
+def _compile_include_patterns(patterns: Tuple[str, ...]) -> Tuple[re.Pattern, List[str], Optional[int]]:
+    """
+    Compila os padrÃµes de glob (relativos Ã  raiz, com "/") numa Ãºnica regex
+    
+    Returns:
+        (regex da uniÃ£o, diretÃ³rios base a varrer, profundidade mÃ¡xima ou None com "**")
+    """
+    alternatives = []
+    bases = []
+    max_depth = 0
+    for pattern in patterns:
+        segments = [seg for seg in pattern.replace('\\', '/').split('/') if seg and seg != '.']
+        regex = ''
+        literal = []
+        for idx, segment in enumerate(segments):
+            last = idx == len(segments) - 1
+            if segment == '**':
+                # zero ou mais diretÃ³rios (no fim, como no glob, sÃ³ casa diretÃ³rios)
+                regex += '(?:[^/]+/)*'
+            else:
+                regex += _glob_segment_to_regex(segment) + ('' if last else '/')
+            if not any(ch in segment for ch in '*?['):
+                if len(literal) == idx and not last:
+                    literal.append(segment)
+        alternatives.append(regex)
+        bases.append('/'.join(literal))
+        max_depth = None if max_depth is None or '**' in segments else max(max_depth, len(segments))
+    
+    # Base contida em outra base jÃ¡ Ã© varrida por ela
+    bases = sorted(set(bases), key=len)
+    roots = []
+    for base in bases:
+        if not any(base == r or not r or base.startswith(r + '/') for r in roots):
+            roots.append(base)
+    flags = re.IGNORECASE if os.name == 'nt' else 0
+    return re.compile('(?:' + '|'.join(alternatives) + r')\Z', flags), roots, max_depth
+
+
+def _read_key_file(
+    file_path: str,
+    max_bytes: Optional[int] = None
+) -> Tuple[Optional[str], Optional[Exception]]:
+    """(conteÃºdo, None) de um arquivo; (None, None) se nÃ£o Ã© arquivo; (None, erro) se falhou"""
+    try:
+        if not os.path.isfile(file_path):
+            return None, None
+        if max_bytes is None or os.path.getsize(file_path) <= max_bytes:
+            with open(file_path, encoding='utf-8-sig') as f:
+                return f.read(), None
+        
+        # Arquivo maior que o limite: mapeia e decodifica sÃ³ o comeÃ§o
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            cut = max_bytes
+            # nÃ£o corta um caractere UTF-8 no meio
+            while cut > 0 and (mm[cut] & 0xC0) == 0x80:
+                cut -= 1
+            content = mm[:cut].decode('utf-8-sig')
+        # mesmas quebras de linha que a leitura em modo texto
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content, None
+    except Exception as e:
+        return None, e
+
+
+def _count_lines(data: bytes) -> int:
+    """Linhas como no modo texto universal (LF, CRLF e CR), contadas nos bytes"""
+    count = data.count(b'\n') + 1
+    if b'\r' in data:
+        count += data.count(b'\r') - data.count(b'\r\n')
+    return count
+
+
+def _iter_py_files(root: str, include_patterns: List[str]) -> List[Tuple[str, str]]:
+    """
+    Arquivos .py sob root que casam com algum padrÃ£o: [(caminho, caminho relativo)]
+    
+    os.scandir recursivo por diretÃ³rio base: o tipo vem do prÃ³prio readdir
+    (DirEntry, sem stat extra), EXCLUDE_DIRS Ã© podado antes de descer e o
+    caminho relativo Ã© testado contra a regex compilada dos padrÃµes.
+    """
+    pattern_re, roots, max_depth = _compile_include_patterns(tuple(include_patterns))
+    match = pattern_re.match
+    found = []
+    
+    def scan(dir_path: str, rel_prefix: str, rel_dir: str, depth: int) -> None:
+        try:
+            entries = list(os.scandir(dir_path))
+        except OSError:
+            return
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                # como o os.walk: nÃ£o segue links simbÃ³licos para diretÃ³rios
+                if name not in EXCLUDE_DIRS and not entry.is_symlink():
+                    subdirs.append(entry)
+            elif name.endswith('.py') and name != '.py' and match(rel_prefix + name):
+                found.append((entry.path, rel_dir + name))
+        if max_depth is not None and depth + 1 >= max_depth:
+            return
+        for entry in subdirs:
+            scan(entry.path, rel_prefix + entry.name + '/', rel_dir + entry.name + os.sep, depth + 1)
+    
+    for base in roots:
+        if base:
+            scan(os.path.join(root, *base.split('/')), base + '/', os.path.join(*base.split('/')) + os.sep, base.count('/') + 1)
+        else:
+            scan(root, '', '', 0)
+    return found
+
+
+def _read_fd(fd: int, size: int) -> bytes:
+    """LÃª size bytes do fd (uma Ãºnica chamada read no caso comum)"""
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        chunk = os.read(fd, remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def _cached_info(cache: Optional[Dict], key: Tuple[str, int, int], file_path: str) -> Optional[FileInfo]:
+    """FileInfo do cache para a chave (com o caminho como foi pedido), ou None"""
+    cached = cache.get(key) if cache is not None else None
+    if cached is not None and cached.path != file_path:
+        path = str(Path(file_path))
+        if cached.path != path:
+            cached = replace(cached, path=path)
+    return cached
+
+
+def _analyze_file(
+    file_path: str,
+    cache: Optional[Dict] = None
+) -> Tuple[Optional[Tuple[str, int, int]], Optional[FileInfo]]:
+    """
+    LÃª e parseia um arquivo Python (nÃ­vel de mÃ³dulo: picklÃ¡vel para o ProcessPool)
+    
+    Returns:
+        (chave do cache, FileInfo); (None, None) se nÃ£o deu para analisar
+    """
+    # open + fstat + read no mesmo fd: sem exists()/stat() extras por arquivo
+    try:
+        fd = os.open(file_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    except FileNotFoundError:
+        return None, None
+    except OSError as e:
+        print(f"âš ï¸  Erro ao analisar {file_path}: {e}")
+        return None, None
+    
+    try:
+        st = os.fstat(fd)
+        
+        # Arquivo sem mudanÃ§as desde a Ãºltima anÃ¡lise: nÃ£o reparseia
+        key = (os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+        cached = _cached_info(cache, key, file_path)
+        if cached is not None:
+            return key, cached
+        
+        data = _read_fd(fd, st.st_size)
+    except OSError as e:
+        print(f"âš ï¸  Erro ao analisar {file_path}: {e}")
+        return None, None
+    finally:
+        os.close(fd)
+    
+    try:
+        # bytes direto para o compile (BOM e PEP 263 tratados por ele, sem decode extra)
+        tree = compile(data, file_path, 'exec', flags=_AST_FLAGS, dont_inherit=True, optimize=2)
+        
+        functions = []
+        classes = []
+        imports = set()
+        
+        # SÃ³ statements: def/class/import nunca ficam dentro de expressÃµes.
+        # Mesma ordem (largura) do ast.walk, sem visitar cada nÃ³ de expressÃ£o.
+        queue = deque(tree.body)
+        while queue:
+            node = queue.popleft()
+            node_type = type(node)
+            if node_type is ast.FunctionDef:
+                functions.append(node.name)
+            elif node_type is ast.ClassDef:
+                classes.append(node.name)
+            elif node_type is ast.Import:
+                imports.update([alias.name for alias in node.names])
+            elif node_type is ast.ImportFrom:
+                imports.add(node.module if node.module else "")
+            # statements simples (Assign, Expr, Return...) nÃ£o tÃªm campo nenhum
+            fields = _STMT_FIELDS_BY_TYPE.get(node_type)
+            if fields is None:
+                fields = tuple(f for f in _STMT_FIELDS if f in node_type._fields)
+                _STMT_FIELDS_BY_TYPE[node_type] = fields
+            for attr in fields:
+                children = getattr(node, attr)
+                if children:
+                    queue.extend(children)
+        
+        return key, FileInfo(
+            path=str(Path(file_path)),
+            size_bytes=st.st_size,
+            lines_count=_count_lines(data),
+            functions=functions,
+            classes=classes,
+            imports=list(imports),
+            complexity_score=len(functions) + len(classes) * 2
+        )
+    
+    except Exception as e:
+        print(f"âš ï¸  Erro ao analisar {file_path}: {e}")
+        return None, None
+
+
+def _load_cache_file() -> Dict[Tuple[str, int, int], FileInfo]:
+    """LÃª o cache de analyze_file do disco (vazio se ausente, ilegÃ­vel ou de outra versÃ£o)"""
+    try:
+        with _ANALYZE_CACHE_FILE.open("rb") as f:
+            version, cache = pickle.load(f)
+    except Exception:
+        return {}
+    return cache if version == _ANALYZE_CACHE_VERSION else {}
+
+
+def _get_analyze_cache() -> Dict[Tuple[str, int, int], FileInfo]:
+    """Cache do processo; na primeira chamada carrega do disco e registra a gravaÃ§Ã£o no atexit"""
+    global _analyze_cache
+    if _analyze_cache is None:
+        _analyze_cache = _load_cache_file()
+        atexit.register(_save_analyze_cache)
+    return _analyze_cache
+
+
+def _remember(key: Optional[Tuple[str, int, int]], info: Optional[FileInfo]) -> None:
+    """Guarda no cache um FileInfo recÃ©m-calculado"""
+    cache = _get_analyze_cache()
+    if info is not None and key not in cache:
+        cache[key] = info
+        _analyze_cache_new.add(key)
+
+
+def _is_current(key: Tuple[str, int, int]) -> bool:
+    """A entrada ainda descreve o arquivo? (existe, com o mesmo mtime e tamanho)"""
+    path, mtime_ns, size = key
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return st.st_mtime_ns == mtime_ns and st.st_size == size
+
+
+def _save_analyze_cache() -> None:
+    """
+    Grava o cache se houve anÃ¡lises novas
+    
+    Junta com o que estÃ¡ no disco (outro processo pode ter gravado depois da
+    nossa leitura) e descarta entradas de arquivos apagados ou modificados.
+    """
+    if not _analyze_cache_new:
+        return
+    merged = _load_cache_file()
+    merged.update(_analyze_cache)
+    merged = {key: info for key, info in merged.items() if _is_current(key)}
+    try:
+        with atomic_write(_ANALYZE_CACHE_FILE, "wb") as f:
+            pickle.dump((_ANALYZE_CACHE_VERSION, merged), f, pickle.HIGHEST_PROTOCOL)
+    except OSError as e:
+        print(f"âš ï¸  Erro ao salvar cache de anÃ¡lise: {e}")
+        return
+    _analyze_cache_new.clear()
 
 
 class CodeAnalyzer:
@@ -37,6 +390,9 @@ class CodeAnalyzer:
     
     def __init__(self, project_root: str):
         self.project_root = Path(project_root)
+        self._cache = _get_analyze_cache()
+        # analyze_project memorizado por padrÃµes (mesma instÃ¢ncia = mesma execuÃ§Ã£o)
+        self._project_cache: Dict[Tuple[str, ...], ProjectContext] = {}
     
     def analyze_project(self, include_patterns: List[str] = None) -> ProjectContext:
         """
@@ -46,46 +402,56 @@ class CodeAnalyzer:
             include_patterns: PadrÃµes de arquivos (ex: ["ace/**/*.py"])
         
         Returns:
-            Contexto do projeto
+            Contexto do projeto (o mesmo objeto se chamado de novo com os
+            mesmos padrÃµes; para reanalisar, crie outro CodeAnalyzer)
         """
         if include_patterns is None:
             include_patterns = ["**/*.py"]
         
-        all_files = []
-        for pattern in include_patterns:
-            all_files.extend(self.project_root.glob(pattern))
+        project_key = tuple(include_patterns)
+        if project_key in self._project_cache:
+            return self._project_cache[project_key]
         
-        # Filtra arquivos Python vÃ¡lidos
-        py_files = [f for f in all_files if f.suffix == '.py' and self._is_valid_file(f)]
+        # Filtra arquivos Python vÃ¡lidos: (caminho, caminho relativo)
+        py_files = _iter_py_files(str(self.project_root), include_patterns)
         
         total_lines = 0
         main_files = {}
+        files = {}
         all_imports = set()
         modules = set()
         
-        for file_path in py_files:
-            info = self.analyze_file(str(file_path))
+        if len(py_files) > PARALLEL_MIN_FILES:
+            infos = self._analyze_many([file_path for file_path, _ in py_files])
+        else:
+            infos = [self.analyze_file(file_path) for file_path, _ in py_files]
+        
+        for (file_path, rel_path), info in zip(py_files, infos):
+            files[rel_path] = info
             if info:
                 total_lines += info.lines_count
                 all_imports.update(info.imports)
                 
                 # Identifica mÃ³dulos principais
-                rel_path = file_path.relative_to(self.project_root)
-                if len(rel_path.parts) >= 2:
-                    modules.add(rel_path.parts[0])
+                top, sep, _ = rel_path.partition(os.sep)
+                if sep:
+                    modules.add(top)
                 
                 # Guarda arquivos principais
                 if self._is_main_file(file_path):
-                    main_files[str(rel_path)] = info
+                    main_files[rel_path] = info
         
-        return ProjectContext(
+        context = ProjectContext(
             root_path=str(self.project_root),
             total_files=len(py_files),
             total_lines=total_lines,
             modules=sorted(list(modules)),
             main_files=main_files,
-            dependencies=all_imports
+            dependencies=all_imports,
+            files=files
         )
+        self._project_cache[project_key] = context
+        return context
     
     def analyze_file(self, file_path: str) -> FileInfo:
         """
@@ -97,52 +463,104 @@ class CodeAnalyzer:
         Returns:
             InformaÃ§Ãµes do arquivo
         """
-        path = Path(file_path)
+        key, info = _analyze_file(file_path, self._cache)
+        _remember(key, info)
+        return info
+    
+    def _analyze_many(self, file_paths: List[str]) -> List[Optional[FileInfo]]:
+        """Analisa vÃ¡rios arquivos: hits do cache direto, o resto em paralelo (processos)"""
+        infos = [None] * len(file_paths)
+        pending = []
+        for idx, file_path in enumerate(file_paths):
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                pending.append(idx)
+                continue
+            key = (os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+            infos[idx] = _cached_info(self._cache, key, file_path)
+            if infos[idx] is None:
+                pending.append(idx)
         
-        if not path.exists():
-            return None
+        to_parse = [file_paths[idx] for idx in pending]
+        workers = min(os.cpu_count() or 1, len(to_parse))
+        # com um nÃºcleo sÃ³ ou poucos arquivos o custo de subir processos nÃ£o compensa
+        if workers > 1 and len(to_parse) > PARALLEL_MIN_FILES:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(
+                    _analyze_file,
+                    to_parse,
+                    chunksize=max(1, len(to_parse) // (workers * 4))
+                ))
+        else:
+            results = [_analyze_file(file_path) for file_path in to_parse]
+        
+        for idx, (key, info) in zip(pending, results):
+            _remember(key, info)
+            infos[idx] = info
+        return infos
+    
+    def analyze_file_fast(self, file_path: str) -> Optional[FileInfo]:
+        """
+        VersÃ£o aproximada de analyze_file: regex em vez de tokenizer + AST
         
+        Serve para contagens (get_module_summary). Pode divergir do AST em
+        casos raros (ex.: "def " dentro de strings multilinha); nÃ£o entra no cache.
+        
+        Args:
+            file_path: Caminho do arquivo
+        
+        Returns:
+            InformaÃ§Ãµes do arquivo
+        """
         try:
-            content = path.read_text(encoding='utf-8-sig')
-            tree = ast.parse(content)
-            
-            functions = []
-            classes = []
-            imports = []
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    functions.append(node.name)
-                elif isinstance(node, ast.ClassDef):
-                    classes.append(node.name)
-                elif isinstance(node, (ast.Import, ast.ImportFrom)):
-                    if isinstance(node, ast.Import):
-                        imports.extend([alias.name for alias in node.names])
-                    else:
-                        imports.append(node.module if node.module else "")
-            
-            lines = content.split('\n')
-            
-            return FileInfo(
-                path=str(path),
-                size_bytes=path.stat().st_size,
-                lines_count=len(lines),
-                functions=functions,
-                classes=classes,
-                imports=list(set(imports)),
-                complexity_score=len(functions) + len(classes) * 2
-            )
-        
-        except Exception as e:
-            print(f"âš ï¸  Erro ao analisar {file_path}: {e}")
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            print(f"âš ï¸  Erro ao analisar {file_path}: {e}")
             return None
+        
+        functions = []
+        classes = []
+        imports = set()
+        for kind, name, names, module in _FAST_DEFS_RE.findall(data.decode('utf-8-sig', 'replace')):
+            if kind == 'def':
+                functions.append(name)
+            elif kind == 'class':
+                classes.append(name)
+            elif names:
+                # "import a.b as c, d" -> a.b, d
+                for part in names.split(','):
+                    part = part.split(' as ')[0].strip().strip('()\\ ')
+                    if part:
+                        imports.add(part)
+            else:
+                imports.add(module)
+        
+        return FileInfo(
+            path=str(Path(file_path)),
+            size_bytes=len(data),
+            lines_count=_count_lines(data),
+            functions=functions,
+            classes=classes,
+            imports=list(imports),
+            complexity_score=len(functions) + len(classes) * 2
+        )
     
-    def extract_key_files(self, focus_on: List[str] = None) -> Dict[str, str]:
+    def extract_key_files(
+        self,
+        focus_on: List[str] = None,
+        max_bytes: Optional[int] = None
+    ) -> Dict[str, str]:
         """
         Extrai conteÃºdo dos arquivos principais
         
         Args:
             focus_on: Lista de padrÃµes (ex: ["parser_*.py", "runner.py"])
+            max_bytes: Limite por arquivo (bytes); maiores sÃ£o mapeados (mmap)
+                e sÃ³ o comeÃ§o Ã© decodificado. None = arquivo inteiro
         
         Returns:
             Dict com filename -> conteÃºdo
@@ -156,40 +574,62 @@ class CodeAnalyzer:
         
         files_content = {}
         
-        for pattern in focus_on:
-            for file_path in self.project_root.glob(pattern):
-                if file_path.is_file() and file_path.suffix == '.py':
-                    rel_path = file_path.relative_to(self.project_root)
-                    try:
-                        content = file_path.read_text(encoding='utf-8-sig')
-                        files_content[str(rel_path)] = content
-                    except Exception as e:
-                        print(f"âš ï¸  Erro ao ler {rel_path}: {e}")
+        # Um padrÃ£o por vez: o dict sai na ordem dos padrÃµes, como antes
+        candidates = [
+            candidate
+            for pattern in focus_on
+            for candidate in _iter_py_files(str(self.project_root), [pattern])
+        ]
+        
+        # Leituras em threads (read libera o GIL); a ordem do resultado Ã© a dos padrÃµes
+        with ThreadPoolExecutor(max_workers=READ_MAX_WORKERS) as pool:
+            reader = partial(_read_key_file, max_bytes=max_bytes)
+            results = pool.map(reader, [file_path for file_path, _ in candidates])
+            for (_, rel_path), (content, error) in zip(candidates, results):
+                if error is not None:
+                    print(f"âš ï¸  Erro ao ler {rel_path}: {error}")
+                elif content is not None:
+                    files_content[rel_path] = content
         
         return files_content
     
-    def get_module_summary(self, module_name: str) -> Dict:
+    def get_module_summary(
+        self,
+        module_name: str,
+        context: Optional[ProjectContext] = None
+    ) -> Dict:
         """
         Resumo de um mÃ³dulo especÃ­fico
         
         Args:
             module_name: Nome do mÃ³dulo (ex: "ace/extraction")
+            context: Resultado de analyze_project; se cobrir o mÃ³dulo,
+                reaproveita os FileInfo sem reler os arquivos
         
         Returns:
             Resumo do mÃ³dulo
         """
-        module_path = self.project_root / module_name
+        infos = None
+        if context is not None:
+            module_dir = os.path.normpath(module_name)
+            infos = [
+                info for rel_path, info in context.files.items()
+                if os.path.dirname(rel_path) == module_dir
+            ]
         
-        if not module_path.exists():
-            return {}
+        if not infos:
+            module_path = self.project_root / module_name
+            
+            if not module_path.exists():
+                return {}
+            
+            infos = [self.analyze_file_fast(str(f)) for f in module_path.glob("*.py")]
         
-        files = list(module_path.glob("*.py"))
         total_functions = 0
         total_classes = 0
         all_imports = set()
         
-        for file_path in files:
-            info = self.analyze_file(str(file_path))
+        for info in infos:
             if info:
                 total_functions += len(info.functions)
                 total_classes += len(info.classes)
@@ -197,24 +637,18 @@ class CodeAnalyzer:
         
         return {
             "module": module_name,
-            "files_count": len(files),
+            "files_count": len(infos),
             "total_functions": total_functions,
             "total_classes": total_classes,
             "dependencies": sorted(list(all_imports))
         }
     
-    def _is_valid_file(self, path: Path) -> bool:
-        """Verifica se arquivo Ã© vÃ¡lido para anÃ¡lise"""
-        # Ignora __pycache__, .venv, etc
-        exclude_dirs = {'.venv', '__pycache__', '.git', 'venv', 'env'}
-        return not any(part in exclude_dirs for part in path.parts)
-    
-    def _is_main_file(self, path: Path) -> bool:
+    def _is_main_file(self, path: str) -> bool:
         """Identifica se Ã© arquivo principal/importante"""
         important_names = {
             'runner', 'parser', 'engine', 'main', 
             'pipeline', 'extractor', 'processor'
         }
-        stem = path.stem.lower()
+        stem = os.path.splitext(os.path.basename(path))[0].lower()
         return any(name in stem for name in important_names)
 
@@ -2,13 +2,32 @@
 Git Handler - Gerencia operações com repositórios Git
 """
 
+import atexit
 import subprocess
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
 
+@lru_cache(maxsize=64)
+def _run_git(repo_path: str, args: Tuple[str, ...]) -> str:
+    """Roda `git -C repo_path *args` e devolve o stdout ("" se falhar)."""
+    cmd = ["git", "-C", repo_path, *args]
+    try:
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return result.stdout
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        # Sem git ou diretório não é repo: devolve string vazia
+        return ""
+
+
 @dataclass
 class CommitInfo:
     hash: str
@@ -21,6 +40,14 @@ class CommitInfo:
 class GitHandler:
     def __init__(self, repo_path: str = None):
         self.repo_path = Path(repo_path) if repo_path else Path.cwd()
+        # `git cat-file --batch` aberto sob demanda por get_blob
+        self._cat_file_proc: Optional[subprocess.Popen] = None
+
+    def __enter__(self) -> "GitHandler":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
 
     def get_recent_commits(self, n: int = 10) -> List[CommitInfo]:
         """Retorna os N commits mais recentes.
@@ -30,25 +57,32 @@ class GitHandler:
         levantar exceção. Isso permite usar o validador mesmo em projetos que
         ainda não estão versionados em git.
         """
-        cmd = ["log", f"-{n}", "--pretty=format:%H|%an|%ad|%s", "--date=iso"]
+        # Cada commit começa com RS (\x1e); campos do cabeçalho separados por NUL.
+        # --name-only -z traz os arquivos de cada commit na mesma chamada:
+        # "<cabeçalho>\n<arq1>\0<arq2>\0\0" (sem a linha se não há arquivos).
+        # %at (epoch do autor) evita parsear data ISO por commit.
+        cmd = [
+            "log", f"-{n}", "--name-only", "-z",
+            "--pretty=format:%x1e%H%x00%an%x00%at%x00%s",
+        ]
         output = self._run_git_command(cmd)
         if not output:
             return []
 
         commits: List[CommitInfo] = []
 
-        for line in output.strip().split("\n"):
-            if not line:
+        for record in output.split("\x1e"):
+            if not record:
                 continue
-            parts = line.split("|", 3)
+            header, _, names = record.partition("\n")
+            parts = header.split("\x00", 3)
             if len(parts) != 4:
                 continue
-            hash_val, author, date_str, message = parts
+            hash_val, author, timestamp, message = parts
+            message = message.rstrip("\x00")
             try:
-                dt = datetime.fromisoformat(
-                    date_str.replace(" ", "T").split("+")[0]
-                )
-            except ValueError:
+                dt = datetime.fromtimestamp(int(timestamp))
+            except (ValueError, OverflowError, OSError):
                 dt = datetime.min
 
             commits.append(
@@ -57,17 +91,80 @@ class GitHandler:
                     author=author,
                     date=dt,
                     message=message,
-                    files_changed=[],
+                    files_changed=[name for name in names.split("\x00") if name],
                 )
             )
         return commits
 
-    def get_file_content(self, file_path: str) -> Optional[str]:
+    def get_file_content(self, file_path: str, rev: Optional[str] = None) -> Optional[str]:
+        """Conteúdo do arquivo na working tree ou, com `rev`, na revisão dada."""
+        if rev is not None:
+            data = self.get_blob(f"{rev}:{file_path}")
+            return data.decode("utf-8") if data is not None else None
         full_path = self.repo_path / file_path
         if full_path.exists():
             return full_path.read_text(encoding="utf-8")
         return None
 
+    def get_blob(self, object_name: str) -> Optional[bytes]:
+        """Conteúdo de um objeto git (sha ou "rev:caminho").
+
+        Todas as consultas passam pelo mesmo processo `git cat-file --batch`
+        (um fork só, não um por arquivo). Devolve None se o objeto não
+        existir, se não houver git ou se o diretório não for repositório.
+        """
+        if "\n" in object_name:
+            return None
+        proc = self._get_cat_file_proc()
+        if proc is None:
+            return None
+        try:
+            proc.stdin.write(object_name.encode("utf-8") + b"\n")
+            proc.stdin.flush()
+            # Resposta: "<sha> <tipo> <tamanho>\n<conteúdo>\n" ou "<nome> missing\n"
+            header = proc.stdout.readline()
+            if not header:
+                self.close()
+                return None
+            parts = header.split()
+            if len(parts) != 3:
+                return None
+            size = int(parts[2])
+            data = proc.stdout.read(size)
+            proc.stdout.read(1)
+            return data
+        except (OSError, ValueError):
+            self.close()
+            return None
+
+    def close(self) -> None:
+        """Encerra o processo `git cat-file --batch`, se aberto."""
+        proc, self._cat_file_proc = self._cat_file_proc, None
+        if proc is None:
+            return
+        atexit.unregister(self.close)
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+        proc.wait()
+        proc.stdout.close()
+
+    def _get_cat_file_proc(self) -> Optional[subprocess.Popen]:
+        if self._cat_file_proc is None:
+            try:
+                self._cat_file_proc = subprocess.Popen(
+                    ["git", "-C", str(self.repo_path), "cat-file", "--batch"],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                )
+            except FileNotFoundError:
+                return None
+            # Rede de segurança para quem não chama close() nem usa `with`
+            atexit.register(self.close)
+        return self._cat_file_proc
+
     def _run_git_command(self, args: List[str]) -> str:
         """Executa um comando git de forma segura.
 
@@ -76,19 +173,16 @@ class GitHandler:
         - Se o comando falhar (exit status diferente de 0),
 
         retorna string vazia ao invés de levantar exceção.
+
+        A saída fica em cache no processo (por repositório + argumentos):
+        o mesmo comando não dispara outro subprocess git.
         """
-        cmd = ["git", "-C", str(self.repo_path)] + args
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            return result.stdout
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            # Sem git ou diretório não é repo: devolve string vazia
-            return ""
+        return _run_git(str(self.repo_path), tuple(args))
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Descarta as saídas de git em cache (ex.: após um commit no meio da execução)."""
+        _run_git.cache_clear()
 
     def get_repo_summary(self) -> Dict:
         """Resumo simples do repositório.
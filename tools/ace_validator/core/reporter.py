@@ -8,11 +8,140 @@ Suporta múltiplos formatos:
 - Console: output colorido no terminal
 """
 
-import json
+import functools
+import io
+import os
+import sys
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from itertools import islice
+from typing import Dict, List, Optional, Set, Any, BinaryIO, TextIO
+from dataclasses import dataclass, fields
+
+# Flags do os.open para gravar Markdown/HTML (None: plataforma sem O_CLOEXEC)
+_WRITE_FLAGS = (
+    os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC
+    if hasattr(os, "O_CLOEXEC") else None
+)
+
+# CSS estático do relatório HTML (as regras que dependem do score vêm depois);
+# fica em arquivo ao lado do módulo e só é lido quando um HTML é gerado
+_HTML_CSS_PATH = Path(__file__).with_name("report.css")
+
+
+@functools.cache
+def _html_css_bytes() -> bytes:
+    """CSS estático (UTF-8), lido do arquivo no primeiro HTML gerado"""
+    return _HTML_CSS_PATH.read_bytes()
+
+
+@functools.cache
+def _load_orjson() -> Any:
+    """orjson (opcional) serializa o dataclass direto, sem asdict(); importado sob demanda"""
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+
+@functools.cache
+def _writer_pool() -> Any:
+    """Pool compartilhado que grava os arquivos fora da thread chamadora (criado no primeiro uso)"""
+    from concurrent.futures import ThreadPoolExecutor
+    return ThreadPoolExecutor(max_workers=3, thread_name_prefix="ace-report-writer")
+
+
+def _log_write_error(fmt: str, future: Any) -> None:
+    """Com wait=False ninguém espera o Future: falha de gravação vai para o stderr"""
+    exc = future.exception()
+    if exc is not None:
+        print(f"⚠️  Erro ao gravar relatório {fmt}: {exc}", file=sys.stderr)
+
+
+# Escape de texto vindo da análise/git no HTML: uma passada em C por campo
+_HTML_ESCAPE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#39;",
+})
+
+
+def _html_escape(value: Any) -> str:
+    """Escapa &, <, >, aspas para interpolar em HTML"""
+    return str(value).translate(_HTML_ESCAPE)
+
+# Partes fixas do relatório Markdown (só os campos mudam entre chamadas)
+_MD_HEADER_TEMPLATE = """# 📊 ACE Validation Report
+
+**Generated:** {timestamp}
+**Report ID:** {report_id}
+
+---
+
+## 📁 Project Information
+
+- **Root Path:** `{root_path}`
+- **Total Files:** {total_files}
+- **Total Lines:** {total_lines:,}
+- **Modules:** {modules}
+
+## 🔀 Git Information
+
+- **Branch:** `{branch}`
+- **Last Commit:** `{last_commit}`
+- **Repository:** `{repo_path}`
+
+---
+
+## 📈 Analysis Results
+
+### Overall Score: {score:.1f}/100
+
+{score_badge}
+
+### 📋 Summary
+
+{summary}
+
+"""
+
+_MD_FOOTER_TEMPLATE = """---
+
+## 🔧 Metadata
+
+- **Validator Version:** {validator_version}
+- **Model:** {model}
+
+*Report generated by ACE Validator*"""
+
+
+def _write_bytes(path: Path, data: bytes) -> None:
+    """Grava o conteúdo com os.open/os.write, sem as camadas de buffer do open()"""
+    if _WRITE_FLAGS is None:
+        path.write_bytes(data)
+        return
+    fd = os.open(str(path), _WRITE_FLAGS, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _snapshot(obj: Any, defaults: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Lê os atributos de defaults de obj de uma vez (via __dict__ quando há);
+    properties/__slots__ caem no getattr com o mesmo default
+    """
+    attrs = getattr(obj, "__dict__", None) or {}
+    return {
+        name: attrs[name] if name in attrs else getattr(obj, name, default)
+        for name, default in defaults.items()
+    }
 
 
 @dataclass
@@ -26,11 +155,65 @@ class ValidationReport:
     recommendations: List[str]
     score: float
     metadata: Dict[str, Any]
+    
+    def _to_jsonable(self) -> Dict[str, Any]:
+        """Dict raso para json.dump (sem a cópia profunda de asdict)"""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+_SEVERITY_ICONS = {
+    "high": "🔴",
+    "medium": "🟡",
+    "low": "🟢",
+}
+
+_SEVERITY_COLORS = {
+    "high": "red",
+    "medium": "yellow",
+    "low": "green",
+}
+
+
+def _build_severity_style(severity: str) -> tuple:
+    """(ícone console, badge Markdown, classe HTML, rótulo HTML) de uma severidade"""
+    key = severity.lower()
+    color = _SEVERITY_COLORS.get(key, "lightgrey")
+    escaped = _html_escape(severity)
+    return (
+        _SEVERITY_ICONS.get(key, "⚪"),
+        f"![{severity}](https://img.shields.io/badge/severity-{severity}-{color})",
+        f"severity-{escaped}",
+        escaped.upper(),
+    )
+
+
+# Severidades conhecidas já resolvidas: um lookup por finding em cada formato
+_SEVERITY = {severity: _build_severity_style(severity) for severity in _SEVERITY_ICONS}
+
+
+def _severity_style(severity: str) -> tuple:
+    """Estilos pré-calculados da severidade (calcula na hora se for desconhecida)"""
+    style = _SEVERITY.get(severity)
+    if style is None:
+        style = _build_severity_style(severity)
+    return style
+
+
+@dataclass
+class _RenderCache:
+    """Fragmentos de um relatório reaproveitados por todos os formatos"""
+    timestamp_file: str
+    score_color: str
+    score_badge_md: str
+    escaped_summary: str
 
 
 class Reporter:
     """Gerador de relatórios de validação"""
     
+    # Diretórios já criados neste processo (evita mkdir a cada instância)
+    _known_dirs: Set[Path] = set()
+    
     def __init__(self, output_dir: str = "reports"):
         """
         Inicializa o reporter
@@ -39,15 +222,18 @@ class Reporter:
             output_dir: Diretório para salvar relatórios
         """
         self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(exist_ok=True)
+        if self.output_dir not in Reporter._known_dirs:
+            self.output_dir.mkdir(exist_ok=True, parents=True)
+            Reporter._known_dirs.add(self.output_dir)
     
     def generate_report(
         self,
         analysis_result: Any,
         project_context: Any,
         git_summary: Dict,
-        formats: List[str] = ["json", "markdown"]
-    ) -> Dict[str, Path]:
+        formats: List[str] = ["json", "markdown"],
+        wait: bool = True
+    ) -> Dict[str, Any]:
         """
         Gera relatório em múltiplos formatos
         
@@ -56,54 +242,96 @@ class Reporter:
             project_context: Contexto do projeto
             git_summary: Resumo do repositório Git
             formats: Lista de formatos ("json", "markdown", "html", "console")
+            wait: Se False, retorna sem esperar a gravação dos arquivos
+                (falhas são registradas no stderr; Future.result() relança o erro)
         
         Returns:
             Dict com formato -> caminho do arquivo gerado
+            (com wait=False, formato -> Future que resolve para o caminho)
         """
+        # Um único instante para timestamp, report_id e nomes dos arquivos
+        now = datetime.now()
+        
         # Monta estrutura do relatório
         report = self._build_report_structure(
             analysis_result,
             project_context,
-            git_summary
+            git_summary,
+            now
         )
         
-        generated_files = {}
-        
-        # Gera cada formato solicitado
-        if "json" in formats:
-            json_path = self._generate_json(report)
-            generated_files["json"] = json_path
+        # Fragmentos comuns aos formatos, calculados uma vez
+        render = self._build_render_cache(report, now)
         
-        if "markdown" in formats:
-            md_path = self._generate_markdown(report)
-            generated_files["markdown"] = md_path
+        generators = {
+            "json": self._generate_json,
+            "markdown": self._generate_markdown,
+            "html": self._generate_html,
+        }
+        requested = [fmt for fmt in generators if fmt in formats]
         
-        if "html" in formats:
-            html_path = self._generate_html(report)
-            generated_files["html"] = html_path
+        # Gera cada formato solicitado; arquivos independentes (I/O) em paralelo
+        generated_files = {}
+        if wait and len(requested) == 1:
+            fmt = requested[0]
+            generated_files[fmt] = generators[fmt](report, now, render)
+        else:
+            pool = _writer_pool()
+            for fmt in requested:
+                generated_files[fmt] = pool.submit(generators[fmt], report, now, render)
+            if not wait:
+                for fmt in requested:
+                    generated_files[fmt].add_done_callback(functools.partial(_log_write_error, fmt))
+            else:
+                for fmt in requested:
+                    generated_files[fmt] = generated_files[fmt].result()
         
         if "console" in formats:
             self._print_console(report)
         
         return generated_files
     
+    def _build_render_cache(
+        self,
+        report: ValidationReport,
+        now: Optional[datetime] = None
+    ) -> _RenderCache:
+        """Calcula os fragmentos compartilhados pelos formatos de arquivo"""
+        return _RenderCache(
+            timestamp_file=(now or datetime.now()).strftime("%Y%m%d_%H%M%S"),
+            score_color=self._get_score_color(report.score),
+            score_badge_md=self._get_score_badge_md(report.score),
+            escaped_summary=_html_escape(report.analysis_summary['summary']),
+        )
+    
     def _build_report_structure(
         self,
         analysis_result: Any,
         project_context: Any,
-        git_summary: Dict
+        git_summary: Dict,
+        now: Optional[datetime] = None
     ) -> ValidationReport:
         """Constrói estrutura unificada do relatório"""
         
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        now = now or datetime.now()
+        timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
+        
+        # Um snapshot por objeto: cada atributo é lido uma única vez
+        pc = _snapshot(project_context, {
+            "root_path": "N/A",
+            "total_files": 0,
+            "total_lines": 0,
+            "modules": [],
+        })
+        ar = _snapshot(analysis_result, {
+            "summary": "No summary available",
+            "score": 0.0,
+            "findings": [],
+            "recommendations": [],
+        })
         
         # Project info
-        project_info = {
-            "root_path": getattr(project_context, "root_path", "N/A"),
-            "total_files": getattr(project_context, "total_files", 0),
-            "total_lines": getattr(project_context, "total_lines", 0),
-            "modules": getattr(project_context, "modules", []),
-        }
+        project_info = pc
         
         # Git info
         git_info = {
@@ -112,25 +340,25 @@ class Reporter:
             "repo_path": git_summary.get("repo_path", "N/A"),
         }
         
-        # Analysis summary
-        analysis_summary = {
-            "summary": getattr(analysis_result, "summary", "No summary available"),
-            "score": getattr(analysis_result, "score", 0.0),
-            "findings_count": len(getattr(analysis_result, "findings", [])),
-            "recommendations_count": len(getattr(analysis_result, "recommendations", [])),
-        }
-        
         # Findings
-        findings = getattr(analysis_result, "findings", [])
+        findings = ar["findings"]
         
         # Recommendations
-        recommendations = getattr(analysis_result, "recommendations", [])
+        recommendations = ar["recommendations"]
+        
+        # Analysis summary
+        analysis_summary = {
+            "summary": ar["summary"],
+            "score": ar["score"],
+            "findings_count": len(findings),
+            "recommendations_count": len(recommendations),
+        }
         
         # Metadata
         metadata = {
             "validator_version": "1.0.0",
             "model": "claude-sonnet-4-20250514",
-            "report_id": f"ACE_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            "report_id": f"ACE_{now.strftime('%Y%m%d_%H%M%S')}",
         }
         
         return ValidationReport(
@@ -140,17 +368,32 @@ class Reporter:
             analysis_summary=analysis_summary,
             findings=findings,
             recommendations=recommendations,
-            score=getattr(analysis_result, "score", 0.0),
+            score=ar["score"],
             metadata=metadata,
         )
     
-    def _generate_json(self, report: ValidationReport) -> Path:
+    def _generate_json(
+        self,
+        report: ValidationReport,
+        now: Optional[datetime] = None,
+        render: Optional[_RenderCache] = None
+    ) -> Path:
         """Gera relatório JSON"""
-        timestamp_file = datetime.now().strftime("%Y%m%d_%H%M%S")
+        render = render or self._build_render_cache(report, now)
+        timestamp_file = render.timestamp_file
         output_path = self.output_dir / f"validation_{timestamp_file}.json"
         
-        # Converte dataclass para dict
-        report_dict = asdict(report)
+        orjson = _load_orjson()
+        if orjson is not None:
+            # Salva com indentação bonita (bytes UTF-8, como ensure_ascii=False)
+            with output_path.open("wb") as f:
+                f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            return output_path
+        
+        # Converte dataclass para dict (referências, não cópias)
+        report_dict = report._to_jsonable()
+        
+        import json
         
         # Salva com indentação bonita
         with output_path.open("w", encoding="utf-8") as f:
@@ -158,412 +401,165 @@ class Reporter:
         
         return output_path
     
-    def _generate_markdown(self, report: ValidationReport) -> Path:
+    def _generate_markdown(
+        self,
+        report: ValidationReport,
+        now: Optional[datetime] = None,
+        render: Optional[_RenderCache] = None
+    ) -> Path:
         """Gera relatório Markdown"""
-        timestamp_file = datetime.now().strftime("%Y%m%d_%H%M%S")
+        render = render or self._build_render_cache(report, now)
+        timestamp_file = render.timestamp_file
         output_path = self.output_dir / f"validation_{timestamp_file}.md"
         
-        md_content = self._build_markdown_content(report)
-        
-        output_path.write_text(md_content, encoding="utf-8")
+        # Monta em memória e grava com um único write()
+        buf = io.StringIO()
+        self._write_markdown_content(report, buf, render)
+        _write_bytes(output_path, buf.getvalue().encode("utf-8"))
         
         return output_path
     
-    def _generate_html(self, report: ValidationReport) -> Path:
+    def _generate_html(
+        self,
+        report: ValidationReport,
+        now: Optional[datetime] = None,
+        render: Optional[_RenderCache] = None
+    ) -> Path:
         """Gera relatório HTML"""
-        timestamp_file = datetime.now().strftime("%Y%m%d_%H%M%S")
+        render = render or self._build_render_cache(report, now)
+        timestamp_file = render.timestamp_file
         output_path = self.output_dir / f"validation_{timestamp_file}.html"
         
-        html_content = self._build_html_content(report)
-        
-        output_path.write_text(html_content, encoding="utf-8")
+        # binário: partes estáticas já codificadas; um único write() no final
+        buf = io.BytesIO()
+        self._write_html_content(report, buf, render)
+        _write_bytes(output_path, buf.getvalue())
         
         return output_path
     
     def _print_console(self, report: ValidationReport):
         """Imprime relatório no console com cores"""
-        print("\n" + "=" * 70)
-        print("📊 ACE VALIDATION REPORT")
-        print("=" * 70)
+        # linhas acumuladas e escritas de uma vez só no final
+        out = []
+        out.append("\n" + "=" * 70)
+        out.append("📊 ACE VALIDATION REPORT")
+        out.append("=" * 70)
         
-        print(f"\n⏰ Timestamp: {report.timestamp}")
-        print(f"🆔 Report ID: {report.metadata['report_id']}")
+        out.append(f"\n⏰ Timestamp: {report.timestamp}")
+        out.append(f"🆔 Report ID: {report.metadata['report_id']}")
         
-        print("\n📁 PROJECT INFO:")
-        print(f"   • Files: {report.project_info['total_files']}")
-        print(f"   • Lines: {report.project_info['total_lines']:,}")
-        print(f"   • Modules: {', '.join(report.project_info['modules'])}")
+        out.append("\n📁 PROJECT INFO:")
+        out.append(f"   • Files: {report.project_info['total_files']}")
+        out.append(f"   • Lines: {report.project_info['total_lines']:,}")
+        out.append(f"   • Modules: {', '.join(report.project_info['modules'])}")
         
-        print("\n🔀 GIT INFO:")
-        print(f"   • Branch: {report.git_info['branch']}")
-        print(f"   • Last Commit: {report.git_info['last_commit']}")
+        out.append("\n🔀 GIT INFO:")
+        out.append(f"   • Branch: {report.git_info['branch']}")
+        out.append(f"   • Last Commit: {report.git_info['last_commit']}")
         
-        print(f"\n📈 OVERALL SCORE: {report.score:.1f}/100")
+        out.append(f"\n📈 OVERALL SCORE: {report.score:.1f}/100")
         
         score_bar = self._get_score_bar(report.score)
-        print(f"   {score_bar}")
+        out.append(f"   {score_bar}")
         
-        print(f"\n📋 SUMMARY:")
-        print(f"   {report.analysis_summary['summary']}")
+        out.append(f"\n📋 SUMMARY:")
+        out.append(f"   {report.analysis_summary['summary']}")
         
         if report.findings:
-            print(f"\n🔍 FINDINGS ({len(report.findings)}):")
-            for idx, finding in enumerate(report.findings[:5], 1):
-                severity = finding.get("severity", "low")
-                icon = self._get_severity_icon(severity)
-                print(f"   {idx}. {icon} {finding.get('area', 'N/A')}")
-                print(f"      {finding.get('description', 'N/A')}")
+            out.append(f"\n🔍 FINDINGS ({len(report.findings)}):")
+            for idx, finding in enumerate(islice(report.findings, 5), 1):
+                icon = _severity_style(finding.get("severity", "low"))[0]
+                out.append(f"   {idx}. {icon} {finding.get('area', 'N/A')}")
+                out.append(f"      {finding.get('description', 'N/A')}")
                 if "file" in finding:
-                    print(f"      📄 {finding['file']}")
+                    out.append(f"      📄 {finding['file']}")
         
         if report.recommendations:
-            print(f"\n💡 RECOMMENDATIONS ({len(report.recommendations)}):")
-            for idx, rec in enumerate(report.recommendations[:5], 1):
-                print(f"   {idx}. {rec}")
+            out.append(f"\n💡 RECOMMENDATIONS ({len(report.recommendations)}):")
+            for idx, rec in enumerate(islice(report.recommendations, 5), 1):
+                out.append(f"   {idx}. {rec}")
+        
+        out.append("\n" + "=" * 70 + "\n")
         
-        print("\n" + "=" * 70 + "\n")
+        sys.stdout.write("\n".join(out) + "\n")
+        sys.stdout.flush()
     
-    def _build_markdown_content(self, report: ValidationReport) -> str:
-        """Constrói conteúdo Markdown do relatório"""
-        
-        lines = [
-            "# 📊 ACE Validation Report",
-            "",
-            f"**Generated:** {report.timestamp}",
-            f"**Report ID:** {report.metadata['report_id']}",
-            "",
-            "---",
-            "",
-            "## 📁 Project Information",
-            "",
-            f"- **Root Path:** `{report.project_info['root_path']}`",
-            f"- **Total Files:** {report.project_info['total_files']}",
-            f"- **Total Lines:** {report.project_info['total_lines']:,}",
-            f"- **Modules:** {', '.join(report.project_info['modules'])}",
-            "",
-            "## 🔀 Git Information",
-            "",
-            f"- **Branch:** `{report.git_info['branch']}`",
-            f"- **Last Commit:** `{report.git_info['last_commit']}`",
-            f"- **Repository:** `{report.git_info['repo_path']}`",
-            "",
-            "---",
-            "",
-            "## 📈 Analysis Results",
-            "",
-            f"### Overall Score: {report.score:.1f}/100",
-            "",
-            self._get_score_badge_md(report.score),
-            "",
-            "### 📋 Summary",
-            "",
-            report.analysis_summary['summary'],
-            "",
-        ]
+    def _write_markdown_content(
+        self,
+        report: ValidationReport,
+        buf: TextIO,
+        render: _RenderCache
+    ) -> None:
+        """Escreve o Markdown do relatório em buf, seção por seção"""
+        
+        buf.write(_MD_HEADER_TEMPLATE.format(
+            timestamp=report.timestamp,
+            report_id=report.metadata['report_id'],
+            root_path=report.project_info['root_path'],
+            total_files=report.project_info['total_files'],
+            total_lines=report.project_info['total_lines'],
+            modules=', '.join(report.project_info['modules']),
+            branch=report.git_info['branch'],
+            last_commit=report.git_info['last_commit'],
+            repo_path=report.git_info['repo_path'],
+            score=report.score,
+            score_badge=render.score_badge_md,
+            summary=report.analysis_summary['summary'],
+        ))
         
         if report.findings:
-            lines.extend([
-                f"## 🔍 Findings ({len(report.findings)})",
-                "",
-            ])
+            buf.write(f"## 🔍 Findings ({len(report.findings)})\n\n")
             
-            for idx, finding in enumerate(report.findings, 1):
-                severity = finding.get("severity", "low")
-                severity_badge = self._get_severity_badge_md(severity)
-                
-                lines.extend([
-                    f"### {idx}. {finding.get('area', 'N/A')} {severity_badge}",
-                    "",
-                    f"**Description:** {finding.get('description', 'N/A')}",
-                    "",
-                ])
-                
-                if "file" in finding:
-                    lines.append(f"**File:** `{finding['file']}`")
-                    lines.append("")
+            buf.write("".join(
+                self._format_finding_md(idx, finding)
+                for idx, finding in enumerate(report.findings, 1)
+            ))
         
         if report.recommendations:
-            lines.extend([
-                f"## 💡 Recommendations ({len(report.recommendations)})",
-                "",
-            ])
+            buf.write(f"## 💡 Recommendations ({len(report.recommendations)})\n\n")
             
             for idx, rec in enumerate(report.recommendations, 1):
-                lines.append(f"{idx}. {rec}")
+                buf.write(f"{idx}. {rec}\n")
             
-            lines.append("")
-        
-        lines.extend([
-            "---",
-            "",
-            "## 🔧 Metadata",
-            "",
-            f"- **Validator Version:** {report.metadata['validator_version']}",
-            f"- **Model:** {report.metadata['model']}",
-            "",
-            "*Report generated by ACE Validator*",
-        ])
-        
-        return "\n".join(lines)
-    
-    def _build_html_content(self, report: ValidationReport) -> str:
-        """Constrói conteúdo HTML do relatório"""
+            buf.write("\n")
         
-        # Score color
-        score_color = self._get_score_color(report.score)
+        buf.write(_MD_FOOTER_TEMPLATE.format(
+            validator_version=report.metadata['validator_version'],
+            model=report.metadata['model'],
+        ))
+    
+    def _write_html_content(
+        self,
+        report: ValidationReport,
+        out: BinaryIO,
+        render: _RenderCache
+    ) -> None:
+        """Escreve o HTML do relatório em out (bytes UTF-8), seção por seção"""
         
-        # Findings HTML
-        findings_html = ""
-        if report.findings:
-            findings_items = []
-            for finding in report.findings:
-                severity = finding.get("severity", "low")
-                severity_class = f"severity-{severity}"
-                
-                file_info = ""
-                if "file" in finding:
-                    file_info = f"<div class='finding-file'>📄 {finding['file']}</div>"
-                
-                findings_items.append(f"""
-                <div class="finding {severity_class}">
-                    <div class="finding-header">
-                        <span class="finding-area">{finding.get('area', 'N/A')}</span>
-                        <span class="severity-badge">{severity.upper()}</span>
-                    </div>
-                    <div class="finding-description">{finding.get('description', 'N/A')}</div>
-                    {file_info}
-                </div>
-                """)
-            
-            findings_html = "\n".join(findings_items)
+        def write(text: str) -> None:
+            out.write(text.encode("utf-8"))
         
-        # Recommendations HTML
-        recommendations_html = ""
-        if report.recommendations:
-            rec_items = [f"<li>{rec}</li>" for rec in report.recommendations]
-            recommendations_html = "<ol>" + "\n".join(rec_items) + "</ol>"
+        # Score color
+        score_color = render.score_color
         
-        html = f"""<!DOCTYPE html>
+        write(f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>ACE Validation Report - {report.metadata['report_id']}</title>
     <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            background: #f5f5f5;
-            padding: 20px;
-        }}
-        
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 8px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            overflow: hidden;
-        }}
-        
-        header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 30px;
-        }}
-        
-        header h1 {{
-            font-size: 2em;
-            margin-bottom: 10px;
-        }}
-        
-        .meta {{
-            opacity: 0.9;
-            font-size: 0.9em;
-        }}
-        
-        .content {{
-            padding: 30px;
-        }}
-        
-        .section {{
-            margin-bottom: 40px;
-        }}
-        
-        .section h2 {{
-            color: #667eea;
-            margin-bottom: 20px;
-            padding-bottom: 10px;
-            border-bottom: 2px solid #e0e0e0;
-        }}
-        
-        .info-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 20px;
-            margin-bottom: 20px;
-        }}
-        
-        .info-card {{
-            background: #f9f9f9;
-            padding: 15px;
-            border-radius: 6px;
-            border-left: 4px solid #667eea;
-        }}
-        
-        .info-card h3 {{
-            font-size: 0.9em;
-            color: #666;
-            margin-bottom: 5px;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-        }}
-        
-        .info-card .value {{
-            font-size: 1.3em;
-            font-weight: bold;
-            color: #333;
-        }}
-        
-        .score-container {{
-            text-align: center;
-            padding: 30px;
-            background: #f9f9f9;
-            border-radius: 8px;
-            margin-bottom: 30px;
-        }}
-        
+""")
+        out.write(_html_css_bytes())
+        # só as regras que dependem do score são montadas por relatório
+        write(f"""        
         .score-value {{
-            font-size: 4em;
-            font-weight: bold;
             color: {score_color};
         }}
         
-        .score-label {{
-            font-size: 1.2em;
-            color: #666;
-            margin-top: 10px;
-        }}
-        
-        .score-bar {{
-            width: 100%;
-            height: 20px;
-            background: #e0e0e0;
-            border-radius: 10px;
-            overflow: hidden;
-            margin-top: 20px;
-        }}
-        
         .score-fill {{
-            height: 100%;
             background: {score_color};
             width: {report.score}%;
-            transition: width 0.3s ease;
-        }}
-        
-        .summary-box {{
-            background: #f0f4ff;
-            padding: 20px;
-            border-radius: 6px;
-            border-left: 4px solid #667eea;
-            font-size: 1.1em;
-            line-height: 1.8;
-        }}
-        
-        .finding {{
-            background: white;
-            border: 1px solid #e0e0e0;
-            border-radius: 6px;
-            padding: 20px;
-            margin-bottom: 15px;
-        }}
-        
-        .finding-header {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 10px;
-        }}
-        
-        .finding-area {{
-            font-weight: bold;
-            font-size: 1.1em;
-            color: #333;
-        }}
-        
-        .severity-badge {{
-            padding: 4px 12px;
-            border-radius: 12px;
-            font-size: 0.8em;
-            font-weight: bold;
-            text-transform: uppercase;
-        }}
-        
-        .severity-high {{
-            border-left: 4px solid #ef4444;
-        }}
-        
-        .severity-high .severity-badge {{
-            background: #fee2e2;
-            color: #991b1b;
-        }}
-        
-        .severity-medium {{
-            border-left: 4px solid #f59e0b;
-        }}
-        
-        .severity-medium .severity-badge {{
-            background: #fef3c7;
-            color: #92400e;
-        }}
-        
-        .severity-low {{
-            border-left: 4px solid #10b981;
-        }}
-        
-        .severity-low .severity-badge {{
-            background: #d1fae5;
-            color: #065f46;
-        }}
-        
-        .finding-description {{
-            color: #666;
-            line-height: 1.6;
-        }}
-        
-        .finding-file {{
-            margin-top: 10px;
-            padding: 8px 12px;
-            background: #f9f9f9;
-            border-radius: 4px;
-            font-family: 'Courier New', monospace;
-            font-size: 0.9em;
-            color: #555;
-        }}
-        
-        ol {{
-            padding-left: 20px;
-        }}
-        
-        ol li {{
-            margin-bottom: 10px;
-            padding-left: 5px;
-        }}
-        
-        footer {{
-            background: #f9f9f9;
-            padding: 20px 30px;
-            text-align: center;
-            color: #666;
-            font-size: 0.9em;
-            border-top: 1px solid #e0e0e0;
         }}
     </style>
 </head>
@@ -591,11 +587,11 @@ class Reporter:
                     </div>
                     <div class="info-card">
                         <h3>Git Branch</h3>
-                        <div class="value">{report.git_info['branch']}</div>
+                        <div class="value">{_html_escape(report.git_info['branch'])}</div>
                     </div>
                     <div class="info-card">
                         <h3>Last Commit</h3>
-                        <div class="value">{report.git_info['last_commit']}</div>
+                        <div class="value">{_html_escape(report.git_info['last_commit'])}</div>
                     </div>
                 </div>
             </div>
@@ -614,18 +610,36 @@ class Reporter:
             <div class="section">
                 <h2>📋 Summary</h2>
                 <div class="summary-box">
-                    {report.analysis_summary['summary']}
+                    {render.escaped_summary}
                 </div>
             </div>
             
             <div class="section">
                 <h2>🔍 Findings ({len(report.findings)})</h2>
-                {findings_html if findings_html else '<p>No findings reported.</p>'}
+                """)
+        
+        # Findings HTML
+        if report.findings:
+            write("\n".join(self._format_finding_html(finding) for finding in report.findings))
+        else:
+            write('<p>No findings reported.</p>')
+        
+        write(f"""
             </div>
             
             <div class="section">
                 <h2>💡 Recommendations ({len(report.recommendations)})</h2>
-                {recommendations_html if recommendations_html else '<p>No recommendations provided.</p>'}
+                """)
+        
+        # Recommendations HTML
+        if report.recommendations:
+            write("<ol>")
+            write("\n".join(f"<li>{_html_escape(rec)}</li>" for rec in report.recommendations))
+            write("</ol>")
+        else:
+            write('<p>No recommendations provided.</p>')
+        
+        write(f"""
             </div>
         </div>
         
@@ -636,18 +650,36 @@ class Reporter:
     </div>
 </body>
 </html>
-"""
-        
-        return html
+""")
     
-    def _get_severity_icon(self, severity: str) -> str:
-        """Retorna ícone para severidade"""
-        icons = {
-            "high": "🔴",
-            "medium": "🟡",
-            "low": "🟢",
-        }
-        return icons.get(severity.lower(), "⚪")
+    def _format_finding_md(self, idx: int, finding: Dict[str, Any]) -> str:
+        """Bloco Markdown de um finding (uma string por finding)"""
+        severity_badge = _severity_style(finding.get("severity", "low"))[1]
+        file_line = f"**File:** `{finding['file']}`\n\n" if "file" in finding else ""
+        return (
+            f"### {idx}. {finding.get('area', 'N/A')} {severity_badge}\n\n"
+            f"**Description:** {finding.get('description', 'N/A')}\n\n"
+            f"{file_line}"
+        )
+    
+    def _format_finding_html(self, finding: Dict[str, Any]) -> str:
+        """Bloco HTML de um finding"""
+        _, _, severity_class, severity_label = _severity_style(finding.get("severity", "low"))
+        
+        file_info = ""
+        if "file" in finding:
+            file_info = f"<div class='finding-file'>📄 {_html_escape(finding['file'])}</div>"
+        
+        return f"""
+                <div class="finding {severity_class}">
+                    <div class="finding-header">
+                        <span class="finding-area">{_html_escape(finding.get('area', 'N/A'))}</span>
+                        <span class="severity-badge">{severity_label}</span>
+                    </div>
+                    <div class="finding-description">{_html_escape(finding.get('description', 'N/A'))}</div>
+                    {file_info}
+                </div>
+                """
     
     def _get_score_color(self, score: float) -> str:
         """Retorna cor baseada no score"""
@@ -677,16 +709,6 @@ class Reporter:
             label = "Needs Improvement"
         
         return f"![Score](https://img.shields.io/badge/score-{score:.0f}%25-{color})"
-    
-    def _get_severity_badge_md(self, severity: str) -> str:
-        """Retorna badge Markdown para severidade"""
-        colors = {
-            "high": "red",
-            "medium": "yellow",
-            "low": "green",
-        }
-        color = colors.get(severity.lower(), "lightgrey")
-        return f"![{severity}](https://img.shields.io/badge/severity-{severity}-{color})"
 
 
 # Função helper para uso simples
@@ -695,8 +717,9 @@ def generate_validation_report(
     project_context,
     git_summary: Dict,
     output_dir: str = "reports",
-    formats: List[str] = ["json", "markdown", "html"]
-) -> Dict[str, Path]:
+    formats: List[str] = ["json", "markdown", "html"],
+    wait: bool = True
+) -> Dict[str, Any]:
     """
     Função helper para gerar relatório rapidamente
     
@@ -706,6 +729,7 @@ def generate_validation_report(
         git_summary: Resumo do Git
         output_dir: Diretório de saída
         formats: Formatos desejados
+        wait: Se False, retorna Futures sem esperar a gravação
     
     Returns:
         Dict com formato -> caminho do arquivo
@@ -715,5 +739,6 @@ def generate_validation_report(
         analysis_result,
         project_context,
         git_summary,
-        formats
+        formats,
+        wait=wait
     )
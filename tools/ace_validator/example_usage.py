@@ -6,7 +6,9 @@ Execute este script para testar funcionalidades bÃ¡sicas
 import os
 from core.git_handler import GitHandler
 from core.code_analyzer import CodeAnalyzer
-from core.claude_client import ClaudeClient, AnalysisRequest
+
+# Caminho do repositÃ³rio ACE (ajuste)
+ACE_PATH = "C:/Users/Natan/PyCharmMiscProject/ACE"
 
 
 def example_git_operations():
@@ -16,7 +18,7 @@ def example_git_operations():
     print("="*60)
     
     # Inicializa handler (ajuste o caminho)
-    git = GitHandler("C:/Users/Natan/PyCharmMiscProject/ACE")
+    git = GitHandler(ACE_PATH)
     
     # Resumo do repositÃ³rio
     print("\nðŸ“Š Resumo do RepositÃ³rio:")
@@ -33,13 +35,15 @@ def example_git_operations():
         print(f"  {commit.message}")
 
 
-def example_code_analysis():
+def example_code_analysis(analyzer: CodeAnalyzer = None):
     """Exemplo: anÃ¡lise de cÃ³digo"""
     print("\n" + "="*60)
     print("EXEMPLO 2: AnÃ¡lise de CÃ³digo")
     print("="*60)
     
-    analyzer = CodeAnalyzer("C:/Users/Natan/PyCharmMiscProject/ACE")
+    # Reaproveita o analyzer do main (analyze_project fica memorizado nele)
+    if analyzer is None:
+        analyzer = CodeAnalyzer(ACE_PATH)
     
     # AnÃ¡lise do projeto
     print("\nðŸ“ Analisando projeto...")
@@ -51,7 +55,7 @@ def example_code_analysis():
     
     # MÃ³dulo especÃ­fico
     print("\nðŸ“¦ MÃ³dulo ace/extraction:")
-    module_info = analyzer.get_module_summary("ace/extraction")
+    module_info = analyzer.get_module_summary("ace/extraction", context)
     print(f"  Arquivos: {module_info.get('files_count', 0)}")
     print(f"  FunÃ§Ãµes: {module_info.get('total_functions', 0)}")
     print(f"  Classes: {module_info.get('total_classes', 0)}")
@@ -71,6 +75,9 @@ def example_claude_analysis():
         print("   Pulando exemplo...\n")
         return
     
+    # Import tardio: requests/ClaudeClient sÃ³ carregam quando este exemplo roda
+    from core.claude_client import ClaudeClient, AnalysisRequest
+    
     print("\nðŸ¤– Inicializando Claude client...")
     claude = ClaudeClient(api_key)
     
@@ -113,8 +120,10 @@ def main():
     except Exception as e:
         print(f"\nâŒ Erro no exemplo Git: {e}")
     
+    analyzer = CodeAnalyzer(ACE_PATH)
+    
     try:
-        example_code_analysis()
+        example_code_analysis(analyzer)
     except Exception as e:
         print(f"\nâŒ Erro no exemplo de anÃ¡lise: {e}")
     
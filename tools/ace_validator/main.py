@@ -15,7 +15,8 @@ from core.reporter import Reporter
 class ACEValidator:
     """Validador principal do ACE"""
     
-    def __init__(self, repo_path: str, api_key: str = None):
+    def __init__(self, repo_path: str, api_key: str = None, batch: bool = False):
+        self.batch = batch  # usa a Message Batches API (mais barata, assíncrona)
         self.git = GitHandler(repo_path)
         self.analyzer = CodeAnalyzer(repo_path)
         self.claude = ClaudeClient(api_key)
@@ -74,8 +75,15 @@ class ACEValidator:
             ]
         )
         
-        print("  • Enviando para análise...")
-        analysis = self.claude.analyze_code(request)
+        if self.batch:
+            print("  • Enviando como lote (aguardando processamento)...")
+            analysis = self.claude.analyze_batch([request])[0]
+            if analysis is None:
+                print("  ❌ Requisição do lote falhou")
+                return
+        else:
+            print("  • Enviando para análise...")
+            analysis = self.claude.analyze_code(request)
         
         print(f"\n📋 Resultado da Análise:")
         print(f"\n{analysis.summary}\n")
@@ -187,16 +195,26 @@ class ACEValidator:
         
         context = self._build_ace_context(None)
         
-        for file_path in files[:3]:  # Limita a 3 arquivos
-            rel_path = file_path.relative_to(self.repo_path)
+        files = files[:3]  # Limita a 3 arquivos
+        rel_paths = [str(file_path.relative_to(self.repo_path)) for file_path in files]
+        
+        # Chamadas independentes: vão juntas para a API, impressão na ordem
+        items = [
+            (rel_path, file_path.read_text(encoding='utf-8'))
+            for rel_path, file_path in zip(rel_paths, files)
+        ]
+        if self.batch:
+            print("⏳ Enviando como lote (aguardando processamento)...\n")
+            all_suggestions = self.claude.suggest_improvements_batch(items, context)
+        else:
+            all_suggestions = self.claude.suggest_improvements_many(items, context)
+        
+        for rel_path, suggestions in zip(rel_paths, all_suggestions):
             print(f"📄 {rel_path}")
             
-            code = file_path.read_text(encoding='utf-8')
-            suggestions = self.claude.suggest_improvements(
-                str(rel_path),
-                code,
-                context
-            )
+            if suggestions is None:
+                print("  ❌ Requisição do lote falhou\n")
+                continue
             
             for suggestion in suggestions:
                 print(f"  • {suggestion}")
@@ -241,12 +259,15 @@ Exemplos de uso:
   python main.py parser parser_acord25         # Valida parser específico
   python main.py commits -n 10                 # Revisa 10 commits
   python main.py improve "ace/extraction/*.py" # Sugere melhorias
+  python main.py --batch improve "ace/*.py"    # Via Message Batches (50% mais barato)
         """
     )
     
     parser.add_argument("--repo", default=".",
                        help="Caminho do repositório ACE (padrão: diretório atual)")
     parser.add_argument("--api-key", help="Anthropic API Key (ou use ANTHROPIC_API_KEY env)")
+    parser.add_argument("--batch", action="store_true",
+                       help="Usa a Message Batches API (50%% mais barato, pode levar até 24h)")
     
     subparsers = parser.add_subparsers(dest="command", help="Comando a executar")
     
@@ -278,7 +299,7 @@ Exemplos de uso:
     
     # Inicializa validador
     try:
-        validator = ACEValidator(args.repo, args.api_key)
+        validator = ACEValidator(args.repo, args.api_key, batch=args.batch)
     except ValueError as e:
         print(f"\n❌ Erro: {e}")
         print("\nConfigure sua API key:")
@@ -303,6 +324,8 @@ Exemplos de uso:
         print(f"\n❌ Erro durante execução: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        validator.git.close()
 
 
 if __name__ == "__main__":
@@ -5,6 +5,7 @@ Teste rápido do sistema de validação
 Execute: python quick_start_validator.py
 """
 
+import importlib.util
 import os
 import sys
 from pathlib import Path
@@ -21,12 +22,8 @@ def check_environment():
         "Estrutura de pastas": False,
     }
     
-    # Check requests
-    try:
-        import requests
-        checks["Módulo requests"] = True
-    except ImportError:
-        pass
+    # Check requests (só localiza o módulo, sem pagar o import)
+    checks["Módulo requests"] = importlib.util.find_spec("requests") is not None
     
     # Check estrutura
     repo_root = Path(__file__).parent.parent.parent
@@ -6,8 +6,10 @@ import os
 import random
 import shutil
 from pathlib import Path
-from collections import Counter
-from typing import List, Tuple
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Iterator, List, Optional, Set, Tuple
 
 from ace.extraction.ocr import extract_text_from_pdf
 from ace.utils.logger import get_logger
@@ -15,41 +17,129 @@ from ace.utils.logger import get_logger
 logger = get_logger('sample_builder')
 
 
+# Tag -> textos que a indicam (ordem importa: keywords[0] é o tipo primário)
+_DOC_TYPE_KEYWORDS = (
+    ("ACORD_25", ("ACORD 25",)),
+    ("LIABILITY_CERT", ("CERTIFICATE OF LIABILITY",)),
+    ("WORKERS_COMP", ("WORKERS COMPENSATION", "WORKERS' COMPENSATION")),
+    ("AUTO", ("AUTOMOBILE", "AUTO LIABILITY")),
+    ("UMBRELLA", ("UMBRELLA", "EXCESS")),
+    ("ENDORSEMENT", ("ENDORSEMENT",)),
+)
+
+# Seguradoras comuns (texto, tag)
+_CARRIER_KEYWORDS = tuple(
+    (insurer, f"CARRIER_{insurer}")
+    for insurer in ("TRAVELERS", "HARTFORD", "ZURICH", "CNA", "LIBERTY", "NATIONWIDE", "STATE FARM")
+)
+
+
+# Textos buscados (cada um uma vez por documento)
+_ALL_NEEDLES = tuple(dict.fromkeys(
+    [needle for _, needles in _DOC_TYPE_KEYWORDS for needle in needles]
+    + [insurer for insurer, _ in _CARRIER_KEYWORDS]
+    + ["CERTIFICATE", "EACH OCCURRENCE"]
+))
+
+# O texto é convertido para maiúsculas em janelas, não inteiro: a cópia
+# extra fica limitada a uma janela. A sobreposição (maior texto - 1) garante
+# que ocorrências na fronteira entre janelas sejam encontradas.
+KEYWORD_SCAN_WINDOW = 1 << 16
+_WINDOW_OVERLAP = max(map(len, _ALL_NEEDLES)) - 1
+
+
+def _find_needles(text: str) -> Set[str]:
+    """Textos de _ALL_NEEDLES presentes em text.upper(), sem copiar o texto todo"""
+    found = set()
+    pending = _ALL_NEEDLES
+    for start in range(0, len(text), KEYWORD_SCAN_WINDOW):
+        window = text[start:start + KEYWORD_SCAN_WINDOW + _WINDOW_OVERLAP].upper()
+        found.update(needle for needle in pending if needle in window)
+        pending = [needle for needle in pending if needle not in found]
+        if not pending:
+            break
+    return found
+
+
 def extract_keywords(text: str) -> List[str]:
     """Extrai keywords relevantes do texto"""
-    keywords = []
-    
-    text_upper = text.upper()
+    # Busca com `in` (str.find em C): para esse punhado de literais é mais
+    # rápida que uma alternação regex única, e acha ocorrências sobrepostas
+    found = _find_needles(text)
     
     # Tipos de documento
-    if "ACORD 25" in text_upper:
-        keywords.append("ACORD_25")
-    if "CERTIFICATE OF LIABILITY" in text_upper:
-        keywords.append("LIABILITY_CERT")
-    if "WORKERS COMPENSATION" in text_upper or "WORKERS' COMPENSATION" in text_upper:
-        keywords.append("WORKERS_COMP")
-    if "AUTOMOBILE" in text_upper or "AUTO LIABILITY" in text_upper:
-        keywords.append("AUTO")
-    if "UMBRELLA" in text_upper or "EXCESS" in text_upper:
-        keywords.append("UMBRELLA")
-    if "ENDORSEMENT" in text_upper:
-        keywords.append("ENDORSEMENT")
-    if "CERTIFICATE" in text_upper and not keywords:
+    keywords = [
+        tag for tag, needles in _DOC_TYPE_KEYWORDS
+        if any(needle in found for needle in needles)
+    ]
+    if not keywords and "CERTIFICATE" in found:
         keywords.append("CERTIFICATE_GENERIC")
     
     # Seguradoras comuns
-    insurers = ["TRAVELERS", "HARTFORD", "ZURICH", "CNA", "LIBERTY", "NATIONWIDE", "STATE FARM"]
-    for insurer in insurers:
-        if insurer in text_upper:
-            keywords.append(f"CARRIER_{insurer}")
+    keywords.extend(tag for insurer, tag in _CARRIER_KEYWORDS if insurer in found)
     
     # Limites GL
-    if "EACH OCCURRENCE" in text_upper:
+    if "EACH OCCURRENCE" in found:
         keywords.append("HAS_GL_LIMITS")
     
     return keywords
 
 
+def _iter_pdfs(root: str, folders: Optional[Set[str]] = None) -> Iterator[str]:
+    """
+    Caminhos (str) dos PDFs sob root, recursivo, na mesma ordem do rglob
+    
+    os.scandir: tipo de cada entrada vem do próprio readdir (sem stat extra
+    nem Path por entrada). Não desce em links simbólicos de diretório.
+    Se `folders` for passado, recebe as pastas que têm pelo menos um PDF.
+    """
+    pending = deque([root])
+    while pending:
+        current = pending.popleft()
+        subdirs = []
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.name.lower().endswith(".pdf") and entry.is_file():
+                            if folders is not None:
+                                folders.add(current)
+                            yield entry.path
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+        # subpastas na frente da fila: percorre em profundidade, como o rglob
+        pending.extendleft(reversed(subdirs))
+
+
+def _analyze_one(pdf_path_str: str, base_str: str) -> Tuple[str, object]:
+    """
+    Analisa um PDF (roda nos processos do pool, por isso é função de módulo)
+    
+    Returns:
+        ("ok", (filepath, keywords, rel_path)), ("empty", None) ou ("error", mensagem)
+    """
+    try:
+        # Caminho relativo para organização
+        rel_path = os.path.relpath(pdf_path_str, base_str)
+        
+        # Extrair texto
+        text = extract_text_from_pdf(pdf_path_str)
+        
+        if text and len(text) > 100:
+            keywords = extract_keywords(text)
+            if not keywords:
+                keywords = ["UNKNOWN"]
+            return "ok", (pdf_path_str, keywords, rel_path)
+        return "empty", None
+    
+    except Exception as e:
+        return "error", str(e)
+
+
 def analyze_pdf_directory(directory: str, max_files: int = None) -> List[Tuple[str, List[str], str]]:
     """
     Analisa diretório de PDFs RECURSIVAMENTE
@@ -63,12 +153,13 @@ def analyze_pdf_directory(directory: str, max_files: int = None) -> List[Tuple[s
     logger.info(f"🔍 Buscando PDFs em: {directory}")
     logger.info(f"   (incluindo todas as subpastas)")
     
-    pdf_files = list(base_path.rglob("*.pdf"))
+    # Lista (não gerador): o total é usado no log e no progresso
+    folders = set()
+    pdf_files = [Path(p) for p in _iter_pdfs(str(base_path), folders)]
     
     logger.info(f"📁 Total de PDFs encontrados: {len(pdf_files)}")
     
-    # Mostrar estrutura de pastas
-    folders = set(p.parent for p in pdf_files)
+    # Mostrar estrutura de pastas (preenchida durante a varredura)
     logger.info(f"📂 Pastas com PDFs: {len(folders)}")
     
     if max_files:
@@ -81,30 +172,33 @@ def analyze_pdf_directory(directory: str, max_files: int = None) -> List[Tuple[s
     errors = 0
     empty = 0
     
-    for i, pdf_path in enumerate(pdf_files, 1):
-        if i % 10 == 0:
-            logger.info(f"   Progresso: {i}/{len(pdf_files)} ({i/len(pdf_files)*100:.1f}%)")
+    pdf_strs = [str(p) for p in pdf_files]
+    workers = min(os.cpu_count() or 1, len(pdf_strs))
+    
+    # Extração (pdfplumber + OCR) é CPU-bound: um processo por núcleo.
+    # Com um núcleo só o pool não compensa, roda no próprio processo.
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        if pool:
+            outcomes = pool.map(_analyze_one, pdf_strs, repeat(str(base_path)), chunksize=8)
+        else:
+            outcomes = map(_analyze_one, pdf_strs, repeat(str(base_path)))
         
-        try:
-            # Caminho relativo para organização
-            rel_path = pdf_path.relative_to(base_path)
+        for i, (pdf_path, (status, payload)) in enumerate(zip(pdf_files, outcomes), 1):
+            if i % 10 == 0:
+                logger.info(f"   Progresso: {i}/{len(pdf_files)} ({i/len(pdf_files)*100:.1f}%)")
             
-            # Extrair texto
-            text = extract_text_from_pdf(str(pdf_path))
-            
-            if text and len(text) > 100:
-                keywords = extract_keywords(text)
-                if not keywords:
-                    keywords = ["UNKNOWN"]
-                results.append((str(pdf_path), keywords, str(rel_path)))
-            else:
+            if status == "ok":
+                results.append(payload)
+            elif status == "empty":
                 empty += 1
-                
-        except Exception as e:
-            errors += 1
-            if errors <= 5:  # Mostrar só os primeiros 5 erros
-                logger.error(f"   Erro em {pdf_path.name}: {e}")
-            continue
+            else:
+                errors += 1
+                if errors <= 5:  # Mostrar só os primeiros 5 erros
+                    logger.error(f"   Erro em {pdf_path.name}: {payload}")
+    finally:
+        if pool:
+            pool.shutdown()
     
     logger.info(f"\n✅ Análise concluída!")
     logger.info(f"   Sucesso: {len(results)}")
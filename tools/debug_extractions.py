@@ -3,8 +3,14 @@ Debug extractions structure
 """
 
 import json
+import sys
 from pathlib import Path
 
+# Adicionar ACE ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ace.utils.json_io import json_loads
+
 # Pegar o relatório mais recente
 reports_dir = Path("reports")
 reports = sorted(reports_dir.glob("parser_validation_*.json"), reverse=True)
@@ -12,8 +18,7 @@ reports = sorted(reports_dir.glob("parser_validation_*.json"), reverse=True)
 latest = reports[0]
 print(f"📄 Lendo: {latest.name}\n")
 
-with open(latest, 'r', encoding='utf-8') as f:
-    data = json.load(f)
+data = json_loads(latest.read_bytes())
 
 extractions = data['extractions']
 
@@ -30,13 +35,14 @@ print("KEYS DA PRIMEIRA EXTRACTION:")
 print("=" * 70)
 print(list(extractions[0].keys()))
 
-# Verificar se tem certificate
-has_cert = any(e.get('certificate') for e in extractions)
-print(f"\nAlguma extraction tem 'certificate'? {has_cert}")
-
-# Verificar outros campos possíveis
+# Uma passada: 'certificate' presente e todos os campos possíveis
+has_cert = False
 all_keys = set()
 for e in extractions:
     all_keys.update(e.keys())
+    if not has_cert and e.get('certificate'):
+        has_cert = True
+
+print(f"\nAlguma extraction tem 'certificate'? {has_cert}")
 
 print(f"\nTodos os campos possíveis: {sorted(all_keys)}")
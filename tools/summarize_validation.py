@@ -2,10 +2,16 @@
 Gera relatório resumido da validação
 """
 
-import json
+import heapq
+import sys
 from pathlib import Path
 from collections import Counter
 
+# Adicionar ACE ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ace.utils.json_io import json_loads
+
 
 def main():
     # Pegar o relatório mais recente
@@ -19,8 +25,7 @@ def main():
     latest = reports[0]
     print(f"📄 Lendo: {latest.name}\n")
     
-    with open(latest, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = json_loads(latest.read_bytes())
     
     extractions = data['extractions']
     files_tested = data['files_tested']
@@ -30,50 +35,68 @@ def main():
     print("=" * 70)
     print(f"Total testado: {files_tested}")
     
-    # Contar sucessos
-    success = [e for e in extractions if e.get('status') == 'success']
-    failures = [e for e in extractions if e.get('status') != 'success']
+    # Uma passada só pelas extractions preenche todos os acumuladores
+    success = []
+    failures = []
+    quality_sum = 0.0
+    coverages_sum = 0
+    quality_buckets = {
+        '1.00 (Perfeito)': 0,
+        '0.90-0.99': 0,
+        '0.83-0.89': 0,
+        '0.50-0.82': 0,
+        '<0.50': 0
+    }
+    coverage_counts = Counter()
+    field_counts = {
+        'policy_number': 0,
+        'effective_date': 0,
+        'expiration_date': 0,
+    }
+    
+    for e in extractions:
+        if e.get('status') != 'success':
+            failures.append(e)
+            continue
+        success.append(e)
+        
+        q = e['quality_score']
+        quality_sum += q
+        if q == 1.00:
+            quality_buckets['1.00 (Perfeito)'] += 1
+        elif q >= 0.90:
+            quality_buckets['0.90-0.99'] += 1
+        elif q >= 0.83:
+            quality_buckets['0.83-0.89'] += 1
+        elif q >= 0.50:
+            quality_buckets['0.50-0.82'] += 1
+        else:
+            quality_buckets['<0.50'] += 1
+        
+        coverages_sum += e['coverages_count']
+        coverage_counts[e['coverages_count']] += 1
+        
+        for field in field_counts:
+            if e.get(field):
+                field_counts[field] += 1
     
     print(f"✅ Sucesso: {len(success)} ({len(success)/files_tested*100:.1f}%)")
     print(f"❌ Falhas: {len(failures)}")
     
     if success:
         # Quality média
-        qualities = [e['quality_score'] for e in success]
-        avg_quality = sum(qualities) / len(qualities)
+        avg_quality = quality_sum / len(success)
         print(f"📈 Quality média: {avg_quality:.2f}")
         
         # Coverages média
-        coverages = [e['coverages_count'] for e in success]
-        avg_cov = sum(coverages) / len(coverages)
+        avg_cov = coverages_sum / len(success)
         print(f"📦 Coverages média: {avg_cov:.1f}")
     
     print(f"\n{'=' * 70}")
     print("📈 DISTRIBUIÇÃO DE QUALITY")
     print("=" * 70)
     
-    quality_buckets = {
-        '1.00 (Perfeito)': 0,
-        '0.90-0.99': 0,
-        '0.83-0.89': 0,
-        '0.50-0.82': 0,
-        '<0.50': 0
-    }
-    
     if success:
-        for e in success:
-            q = e['quality_score']
-            if q == 1.00:
-                quality_buckets['1.00 (Perfeito)'] += 1
-            elif q >= 0.90:
-                quality_buckets['0.90-0.99'] += 1
-            elif q >= 0.83:
-                quality_buckets['0.83-0.89'] += 1
-            elif q >= 0.50:
-                quality_buckets['0.50-0.82'] += 1
-            else:
-                quality_buckets['<0.50'] += 1
-    
         for bucket, count in quality_buckets.items():
             if count > 0:
                 pct = count / len(success) * 100
@@ -98,8 +121,6 @@ def main():
     print("=" * 70)
     
     if success:
-        coverage_counts = Counter([e['coverages_count'] for e in success])
-        
         for cov, count in sorted(coverage_counts.items(), reverse=True):
             pct = count / len(success) * 100
             print(f"  {cov} coverages: {count} ({pct:.1f}%)")
@@ -109,20 +130,6 @@ def main():
     print("=" * 70)
     
     if success:
-        field_counts = {
-            'policy_number': 0,
-            'effective_date': 0,
-            'expiration_date': 0,
-        }
-        
-        for e in success:
-            if e.get('policy_number'):
-                field_counts['policy_number'] += 1
-            if e.get('effective_date'):
-                field_counts['effective_date'] += 1
-            if e.get('expiration_date'):
-                field_counts['expiration_date'] += 1
-        
         for field, count in field_counts.items():
             pct = count / len(success) * 100
             print(f"  {field}: {count} ({pct:.1f}%)")
@@ -132,7 +139,8 @@ def main():
     print("=" * 70)
     
     if success:
-        top = sorted(success, key=lambda x: x['quality_score'], reverse=True)[:5]
+        # nlargest/nsmallest: heap de 5, mesmo resultado (e empates) do sorted()[:5]
+        top = heapq.nlargest(5, success, key=lambda x: x['quality_score'])
         for e in top:
             filename = Path(e['file']).name[:50]
             print(f"  {filename}: Q={e['quality_score']:.2f}, Cov={e['coverages_count']}")
@@ -142,7 +150,7 @@ def main():
     print("=" * 70)
     
     if success:
-        bottom = sorted(success, key=lambda x: x['quality_score'])[:5]
+        bottom = heapq.nsmallest(5, success, key=lambda x: x['quality_score'])
         for e in bottom:
             filename = Path(e['file']).name[:50]
             print(f"  {filename}: Q={e['quality_score']:.2f}, Cov={e['coverages_count']}")
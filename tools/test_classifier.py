@@ -2,7 +2,9 @@
 Testa o classificador com amostra real
 """
 
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # Adicionar diretório raiz ao path
@@ -15,6 +17,17 @@ from ace.utils.logger import get_logger
 logger = get_logger('test.classifier')
 
 
+def _classify_one(pdf_path_str: str):
+    """Extrai e classifica um PDF (roda nos processos do pool)"""
+    try:
+        text = extract_text_from_pdf(pdf_path_str)
+        if not text:
+            return None, None
+        return classify_document(text), None
+    except Exception as e:
+        return None, str(e)
+
+
 def test_classifier_on_sample():
     """Testa classificador nos 100 PDFs"""
     
@@ -31,35 +44,38 @@ def test_classifier_on_sample():
     by_type = {}
     confidences = []
     
-    # Classificar cada PDF
-    for i, pdf_path in enumerate(pdfs[:20], 1):  # Testar nos primeiros 20
-        logger.info(f"[{i}/20] {pdf_path.name[:60]}")
+    # Classificar cada PDF (extração em paralelo, resultados na ordem original)
+    batch = pdfs[:20]  # Testar nos primeiros 20
+    workers = min(os.cpu_count() or 1, len(batch))
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        outcomes = (pool.map(_classify_one, map(str, batch), chunksize=1) if pool
+                    else map(_classify_one, map(str, batch)))
+    
+        for i, (pdf_path, (result, error)) in enumerate(zip(batch, outcomes), 1):
+            logger.info(f"[{i}/20] {pdf_path.name[:60]}")
         
-        try:
-            # Extrair texto
-            text = extract_text_from_pdf(str(pdf_path))
-            
-            if not text:
+            if error is not None:
+                logger.error(f"  ❌ Erro: {error}")
+                continue
+        
+            if result is None:
                 logger.warning("  ⚠️  Sem texto")
                 continue
-            
-            # Classificar
-            result = classify_document(text)
-            
+        
             # Contar
             doc_type = result.doc_type.value
             by_type[doc_type] = by_type.get(doc_type, 0) + 1
             confidences.append(result.confidence)
-            
+        
             # Mostrar resultado
             logger.info(f"  📋 Tipo: {result.doc_type.value}")
             logger.info(f"  📊 Confiança: {result.confidence:.2f}")
             logger.info(f"  🔍 Indicadores: {', '.join(result.indicators[:3])}")
             logger.info("")
-            
-        except Exception as e:
-            logger.error(f"  ❌ Erro: {e}")
-            continue
+    finally:
+        if pool:
+            pool.shutdown()
     
     # Resumo
     logger.info("=" * 70)